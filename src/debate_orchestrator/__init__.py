@@ -1,6 +1,7 @@
 """debate_orchestrator パッケージ。"""
 
+from .branching import DebateVariant, fork_debate, snapshot_state
 from .config import DebateConfig
 from .debate_loop import run_debate
 
-__all__ = ["DebateConfig", "run_debate"]
+__all__ = ["DebateConfig", "DebateVariant", "fork_debate", "run_debate", "snapshot_state"]
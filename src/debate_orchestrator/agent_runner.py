@@ -1,11 +1,43 @@
 from __future__ import annotations
 
+import codecs
+from collections.abc import Callable
 from dataclasses import dataclass
+import functools
+import os
+from pathlib import Path
+import random
+import re
 import shlex
+import signal
 import subprocess
+import tempfile
+import threading
 import time
+from typing import BinaryIO
 
-from .models import TurnStatus
+from .models import FailureKind, TurnStatus
+
+READ_CHUNK_BYTES = 64 * 1024
+STDERR_TAIL_BYTES = 4 * 1024
+PIPE_DRAIN_GRACE_SEC = 1.0
+
+PERMANENT_EXIT_CODES = frozenset({126, 127})
+PERMANENT_OS_ERRORS = (FileNotFoundError, PermissionError, NotADirectoryError, IsADirectoryError)
+TRANSIENT_STDERR_RE = re.compile(
+    r"rate.?limit|too many requests|\b429\b|temporar|try again|overloaded|timed? ?out"
+    r"|\bHTTP(?:/\d(?:\.\d)?)?[ :]+5\d\d\b|\bstatus(?: code)?[:= ]+5\d\d\b",
+    flags=re.IGNORECASE,
+)
+PERMANENT_STDERR_RE = re.compile(
+    r"unauthori[sz]ed|authenticat|not logged in|log ?in required"
+    r"|(?:invalid|missing|incorrect) api key|api key (?:is )?(?:invalid|missing|not set)"
+    r"|forbidden|permission denied|command not found"
+    r"|\bHTTP(?:/\d(?:\.\d)?)?[ :]+40[13]\b|\bstatus(?: code)?[:= ]+40[13]\b"
+    r"|unknown (option|argument|command|model)|unrecognized (option|argument)|invalid (option|argument)"
+    r"|^usage:",
+    flags=re.IGNORECASE | re.MULTILINE,
+)
 
 
 @dataclass
@@ -15,76 +47,446 @@ class AgentCallResult:
     elapsed_ms: int
     error: str | None = None
     attempts: int = 1
+    cpu_ms: int = 0
+    prompt_bytes: int = 0
+    output_bytes: int = 0
+    truncated: bool = False
+    spill_path: Path | None = None
+    failure_kind: FailureKind | None = None
+    circuit_open: bool = False
+    wall_ms: int = 0
+    sent_prompt: str | None = None
+
+
+def classify_failure(
+    status: TurnStatus,
+    returncode: int | None = None,
+    stderr: str = "",
+    error: OSError | None = None,
+) -> FailureKind | None:
+    if status == TurnStatus.OK:
+        return None
+    if error is not None:
+        if isinstance(error, PERMANENT_OS_ERRORS):
+            return FailureKind.PERMANENT
+        return FailureKind.TRANSIENT
+    if status != TurnStatus.ERROR:
+        return FailureKind.TRANSIENT
+    if returncode in PERMANENT_EXIT_CODES:
+        return FailureKind.PERMANENT
+    # 認証・使い方の誤りは "try again" などを含んでいても再試行では直らない
+    if PERMANENT_STDERR_RE.search(stderr):
+        return FailureKind.PERMANENT
+    if TRANSIENT_STDERR_RE.search(stderr):
+        return FailureKind.TRANSIENT
+    return FailureKind.TRANSIENT
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int) -> None:
+        if threshold < 1:
+            raise ValueError("threshold は1以上を指定してください")
+        self._threshold = threshold
+        self._lock = threading.Lock()
+        self._consecutive_permanent = 0
+        self.last_error: str | None = None
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._consecutive_permanent >= self._threshold
+
+    def record(self, result: AgentCallResult) -> None:
+        with self._lock:
+            if result.status == TurnStatus.OK:
+                self._consecutive_permanent = 0
+            elif result.failure_kind == FailureKind.PERMANENT:
+                self._consecutive_permanent += 1
+                self.last_error = result.error
+            result.circuit_open = self._consecutive_permanent >= self._threshold
+
+
+class BoundedCapture:
+    def __init__(
+        self,
+        limit: int | None,
+        spill_dir: Path | None = None,
+        on_text: Callable[[str], None] | None = None,
+    ) -> None:
+        self._limit = limit
+        self._spill_dir = spill_dir
+        self._on_text = on_text
+        self._stream_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._spill_file: BinaryIO | None = None
+        self.head = bytearray()
+        self.total_bytes = 0
+        self.spill_path: Path | None = None
+
+    @property
+    def truncated(self) -> bool:
+        return self._limit is not None and self.total_bytes > self._limit
+
+    def feed(self, chunk: bytes) -> None:
+        self.total_bytes += len(chunk)
+        if self._on_text is not None:
+            text = self._stream_decoder.decode(chunk)
+            if text:
+                self._on_text(text)
+        if self._spill_file is not None:
+            self._spill_file.write(chunk)
+            return
+
+        if self._limit is None or len(self.head) + len(chunk) <= self._limit:
+            self.head += chunk
+            return
+
+        room = self._limit - len(self.head)
+        if self._spill_dir is not None:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+            self._spill_file = tempfile.NamedTemporaryFile(
+                mode="wb",
+                dir=self._spill_dir,
+                prefix="agent_output_",
+                suffix=".txt",
+                delete=False,
+            )
+            self.spill_path = Path(self._spill_file.name)
+            self._spill_file.write(self.head)
+            self._spill_file.write(chunk)
+        self.head += chunk[:room]
+
+    def close(self) -> None:
+        if self._on_text is not None:
+            text = self._stream_decoder.decode(b"", final=True)
+            if text:
+                self._on_text(text)
+        if self._spill_file is not None:
+            self._spill_file.close()
+
+    def text(self) -> str:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        return decoder.decode(bytes(self.head), final=not self.truncated)
+
+
+class TailCapture:
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self.tail = bytearray()
+
+    def feed(self, chunk: bytes) -> None:
+        self.tail += chunk
+        if len(self.tail) > self._limit:
+            del self.tail[: len(self.tail) - self._limit]
+
+    def close(self) -> None:
+        pass
+
+    def text(self) -> str:
+        return bytes(self.tail).decode("utf-8", errors="replace")
+
+
+def pump_stream(stream: BinaryIO, capture: BoundedCapture | TailCapture) -> None:
+    try:
+        while True:
+            chunk = stream.read1(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            capture.feed(chunk)
+    finally:
+        capture.close()
+        stream.close()
+
+
+def _feed_stdin(stream: BinaryIO, payload: bytes) -> None:
+    try:
+        stream.write(payload)
+    except (BrokenPipeError, OSError):
+        pass
+    finally:
+        try:
+            stream.close()
+        except OSError:
+            pass
+
+
+def _kill_process_group(process: subprocess.Popen[bytes]) -> None:
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+            return
+        except (ProcessLookupError, PermissionError):
+            pass
+    process.kill()
+
+
+def _join_all(threads: list[threading.Thread], timeout_sec: float) -> bool:
+    deadline = time.monotonic() + timeout_sec
+    for thread in threads:
+        thread.join(timeout=max(0.0, deadline - time.monotonic()))
+    return not any(thread.is_alive() for thread in threads)
 
 
-class AgentRunner:
-    def __init__(self, agent_cmd: str) -> None:
+class _ProcessTimeout(Exception):
+    def __init__(self, stdout: BoundedCapture) -> None:
+        super().__init__()
+        self.stdout = stdout
+
+
+def _wait_for_exit(process: subprocess.Popen[bytes], deadline: float) -> float:
+    if not hasattr(os, "wait4"):
+        process.wait(timeout=max(0.0, deadline - time.monotonic()))
+        return 0.0
+
+    delay = 0.0005
+    while True:
+        pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+        if pid:
+            process.returncode = os.waitstatus_to_exitcode(status)
+            return rusage.ru_utime + rusage.ru_stime
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise subprocess.TimeoutExpired(process.args, 0)
+        delay = min(delay * 2, remaining, 0.05)
+        time.sleep(delay)
+
+
+@dataclass
+class _ProcessOutput:
+    returncode: int
+    stdout: BoundedCapture
+    stderr: TailCapture
+    cpu_seconds: float
+
+
+@dataclass
+class AttemptTotals:
+    cpu_seconds: float = 0.0
+    prompt_bytes: int = 0
+    elapsed_ms: int = 0
+    backoff_sec: float = 0.0
+
+
+class RetryingRunner:
+    def __init__(
+        self,
+        circuit_breaker_threshold: int = 3,
+        backoff_base_sec: float = 0.5,
+        backoff_max_sec: float = 8.0,
+    ) -> None:
+        self._backoff_base_sec = backoff_base_sec
+        self._backoff_max_sec = backoff_max_sec
+        self._random = random.Random()
+        self.circuit_breaker = CircuitBreaker(circuit_breaker_threshold)
+
+    def _backoff(self, attempt: int) -> float:
+        ceiling = min(self._backoff_max_sec, self._backoff_base_sec * 2 ** (attempt - 1))
+        delay_sec = self._random.uniform(0, ceiling) if ceiling > 0 else 0.0
+        self._sleep(delay_sec)
+        return delay_sec
+
+    def _sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _wall_ms(self, started: float, totals: AttemptTotals) -> int:
+        return int((time.monotonic() - started) * 1000)
+
+    def _run_with_retries(
+        self,
+        retry_count: int,
+        attempt_once: Callable[[int, AttemptTotals], AgentCallResult],
+    ) -> AgentCallResult:
+        if self.circuit_breaker.is_open:
+            return AgentCallResult(
+                response="",
+                status=TurnStatus.ERROR,
+                elapsed_ms=0,
+                error=f"サーキットブレーカー作動中: {self.circuit_breaker.last_error}",
+                attempts=0,
+                failure_kind=FailureKind.PERMANENT,
+                circuit_open=True,
+            )
+
+        attempts = retry_count + 1
+        totals = AttemptTotals()
+        result: AgentCallResult | None = None
+        started = time.monotonic()
+        for attempt in range(1, attempts + 1):
+            result = attempt_once(attempt, totals)
+            totals.elapsed_ms += result.elapsed_ms
+            if result.status == TurnStatus.OK or result.failure_kind == FailureKind.PERMANENT:
+                break
+            if attempt < attempts:
+                totals.backoff_sec += self._backoff(attempt)
+
+        if result is None:
+            raise RuntimeError(f"{type(self).__name__}.ask が結果を返せませんでした")
+        # elapsed_ms は最後の試行のみなので、再試行と待機を含めた所要時間を別に残す
+        result.wall_ms = self._wall_ms(started, totals)
+        self.circuit_breaker.record(result)
+        return result
+
+
+class AgentRunner(RetryingRunner):
+    def __init__(
+        self,
+        agent_cmd: str,
+        max_response_bytes: int | None = None,
+        spill_dir: Path | None = None,
+        circuit_breaker_threshold: int = 3,
+        backoff_base_sec: float = 0.5,
+        backoff_max_sec: float = 8.0,
+    ) -> None:
+        super().__init__(circuit_breaker_threshold, backoff_base_sec, backoff_max_sec)
         command = shlex.split(agent_cmd)
         if not command:
             raise ValueError("agent_cmd が空です")
         self._command = command
+        self._max_response_bytes = max_response_bytes
+        self._spill_dir = spill_dir
 
-    def ask(self, prompt: str, timeout_sec: int, retry_count: int = 1) -> AgentCallResult:
-        attempts = retry_count + 1
-        last_result: AgentCallResult | None = None
+    def _run_once(
+        self,
+        prompt: str,
+        timeout_sec: int,
+        on_output: Callable[[str], None] | None = None,
+    ) -> _ProcessOutput:
+        deadline = time.monotonic() + timeout_sec
+        # 孫プロセスもまとめて止められるよう、エージェントは独立したプロセスグループで起動する
+        process = subprocess.Popen(
+            self._command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=hasattr(os, "killpg"),
+        )
+        stdout = BoundedCapture(self._max_response_bytes, self._spill_dir, on_output)
+        stderr = TailCapture(STDERR_TAIL_BYTES)
+        threads = [
+            threading.Thread(target=_feed_stdin, args=(process.stdin, prompt.encode("utf-8"))),
+            threading.Thread(target=pump_stream, args=(process.stdout, stdout)),
+            threading.Thread(target=pump_stream, args=(process.stderr, stderr)),
+        ]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
 
-        for attempt in range(1, attempts + 1):
-            start = time.monotonic()
-            try:
-                completed = subprocess.run(
-                    self._command,
-                    input=prompt,
-                    text=True,
-                    capture_output=True,
-                    timeout=timeout_sec,
-                    check=False,
-                )
-                elapsed_ms = int((time.monotonic() - start) * 1000)
-                stdout = completed.stdout.strip()
-                stderr = completed.stderr.strip()
-
-                if completed.returncode != 0:
-                    last_result = AgentCallResult(
-                        response=stdout,
-                        status=TurnStatus.ERROR,
-                        elapsed_ms=elapsed_ms,
-                        error=stderr or f"終了コード: {completed.returncode}",
-                        attempts=attempt,
-                    )
-                elif not stdout:
-                    last_result = AgentCallResult(
-                        response="",
-                        status=TurnStatus.EMPTY,
-                        elapsed_ms=elapsed_ms,
-                        error="空の応答です",
-                        attempts=attempt,
-                    )
-                else:
-                    return AgentCallResult(
-                        response=stdout,
-                        status=TurnStatus.OK,
-                        elapsed_ms=elapsed_ms,
-                        attempts=attempt,
-                    )
-            except subprocess.TimeoutExpired:
-                elapsed_ms = int((time.monotonic() - start) * 1000)
-                last_result = AgentCallResult(
-                    response="",
-                    status=TurnStatus.TIMEOUT,
-                    elapsed_ms=elapsed_ms,
-                    error=f"タイムアウト: {timeout_sec}秒",
-                    attempts=attempt,
-                )
-            except OSError as error:
-                elapsed_ms = int((time.monotonic() - start) * 1000)
-                last_result = AgentCallResult(
-                    response="",
-                    status=TurnStatus.ERROR,
-                    elapsed_ms=elapsed_ms,
-                    error=f"起動失敗: {error}",
-                    attempts=attempt,
-                )
-
-        if last_result is None:
-            raise RuntimeError("AgentRunner.ask が結果を返せませんでした")
-        return last_result
+        try:
+            cpu_seconds = _wait_for_exit(process, deadline)
+        except subprocess.TimeoutExpired:
+            _kill_process_group(process)
+            process.wait()
+            _join_all(threads, PIPE_DRAIN_GRACE_SEC)
+            raise _ProcessTimeout(stdout) from None
+
+        # 終了後もパイプを握ったままの孫プロセスは EOF を待たずにグループごと止める。
+        # それでも閉じない読み取りスレッドは daemon のまま手放す
+        if not _join_all(threads, min(PIPE_DRAIN_GRACE_SEC, max(0.0, deadline - time.monotonic()))):
+            _kill_process_group(process)
+            _join_all(threads, PIPE_DRAIN_GRACE_SEC)
+        return _ProcessOutput(
+            returncode=process.returncode,
+            stdout=stdout,
+            stderr=stderr,
+            cpu_seconds=cpu_seconds,
+        )
+
+    def ask(
+        self,
+        prompt: str,
+        timeout_sec: int,
+        retry_count: int = 1,
+        on_output: Callable[[int, str], None] | None = None,
+    ) -> AgentCallResult:
+        return self._run_with_retries(
+            retry_count,
+            lambda attempt, totals: self._attempt(prompt, timeout_sec, attempt, totals, on_output),
+        )
+
+    def _attempt(
+        self,
+        prompt: str,
+        timeout_sec: int,
+        attempt: int,
+        totals: AttemptTotals,
+        on_output: Callable[[int, str], None] | None = None,
+    ) -> AgentCallResult:
+        on_text = None
+        if on_output is not None:
+            # 試行の開始を空文字列で知らせ、受け手が失敗した前の試行の出力を破棄できるようにする
+            on_output(attempt, "")
+            on_text = functools.partial(on_output, attempt)
+        start = time.monotonic()
+        try:
+            completed = self._run_once(prompt, timeout_sec, on_text)
+        except _ProcessTimeout as timeout:
+            totals.prompt_bytes += len(prompt.encode("utf-8"))
+            return AgentCallResult(
+                response="",
+                status=TurnStatus.TIMEOUT,
+                elapsed_ms=int((time.monotonic() - start) * 1000),
+                error=f"タイムアウト: {timeout_sec}秒",
+                attempts=attempt,
+                cpu_ms=int(totals.cpu_seconds * 1000),
+                prompt_bytes=totals.prompt_bytes,
+                output_bytes=timeout.stdout.total_bytes,
+                truncated=timeout.stdout.truncated,
+                spill_path=timeout.stdout.spill_path,
+                failure_kind=FailureKind.TRANSIENT,
+            )
+        except OSError as error:
+            return AgentCallResult(
+                response="",
+                status=TurnStatus.ERROR,
+                elapsed_ms=int((time.monotonic() - start) * 1000),
+                error=f"起動失敗: {error}",
+                attempts=attempt,
+                cpu_ms=int(totals.cpu_seconds * 1000),
+                prompt_bytes=totals.prompt_bytes,
+                failure_kind=classify_failure(TurnStatus.ERROR, error=error),
+            )
+
+        elapsed_ms = int((time.monotonic() - start) * 1000)
+        totals.cpu_seconds += completed.cpu_seconds
+        totals.prompt_bytes += len(prompt.encode("utf-8"))
+        stdout = completed.stdout.text().strip()
+        stderr = completed.stderr.text().strip()
+        output = {
+            "cpu_ms": int(totals.cpu_seconds * 1000),
+            "prompt_bytes": totals.prompt_bytes,
+            "output_bytes": completed.stdout.total_bytes,
+            "truncated": completed.stdout.truncated,
+            "spill_path": completed.stdout.spill_path,
+        }
+
+        if completed.returncode != 0:
+            return AgentCallResult(
+                response=stdout,
+                status=TurnStatus.ERROR,
+                elapsed_ms=elapsed_ms,
+                error=stderr or f"終了コード: {completed.returncode}",
+                attempts=attempt,
+                failure_kind=classify_failure(
+                    TurnStatus.ERROR,
+                    returncode=completed.returncode,
+                    stderr=stderr,
+                ),
+                **output,
+            )
+        if not stdout:
+            return AgentCallResult(
+                response="",
+                status=TurnStatus.EMPTY,
+                elapsed_ms=elapsed_ms,
+                error="空の応答です",
+                attempts=attempt,
+                failure_kind=FailureKind.TRANSIENT,
+                **output,
+            )
+        return AgentCallResult(
+            response=stdout,
+            status=TurnStatus.OK,
+            elapsed_ms=elapsed_ms,
+            attempts=attempt,
+            **output,
+        )
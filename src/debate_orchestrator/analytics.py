@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import argparse
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import json
+import math
+from pathlib import Path
+import sys
+
+from .run_record import RUN_RECORD_TYPE, RUN_RECORD_VERSION
+
+
+class _Categories:
+    def __init__(self) -> None:
+        self.labels: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def encode(self, label: str) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            code = len(self.labels)
+            self._codes[label] = code
+            self.labels.append(label)
+        return code
+
+
+@dataclass
+class RunColumns:
+    topic: array = field(default_factory=lambda: array("l"))
+    started_at: array = field(default_factory=lambda: array("d"))
+    rounds: array = field(default_factory=lambda: array("l"))
+    stop_kind: array = field(default_factory=lambda: array("l"))
+    topics: _Categories = field(default_factory=_Categories)
+    stop_kinds: _Categories = field(default_factory=_Categories)
+
+    def __len__(self) -> int:
+        return len(self.rounds)
+
+
+@dataclass
+class CallColumns:
+    run: array = field(default_factory=lambda: array("l"))
+    round_index: array = field(default_factory=lambda: array("l"))
+    kind: array = field(default_factory=lambda: array("l"))
+    role: array = field(default_factory=lambda: array("l"))
+    status: array = field(default_factory=lambda: array("l"))
+    elapsed_ms: array = field(default_factory=lambda: array("l"))
+    attempts: array = field(default_factory=lambda: array("l"))
+    response_chars: array = field(default_factory=lambda: array("l"))
+    fallback: array = field(default_factory=lambda: array("b"))
+    kinds: _Categories = field(default_factory=_Categories)
+    roles: _Categories = field(default_factory=_Categories)
+    statuses: _Categories = field(default_factory=_Categories)
+
+    def __len__(self) -> int:
+        return len(self.run)
+
+
+def _iter_record_paths(paths: Iterable[Path]) -> Iterator[Path]:
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(path.rglob("*.json"))
+        else:
+            yield path
+
+
+def _parse_record(
+    record: object,
+) -> tuple[str, float, int, str, list[tuple[int, str, str, str, int, int, int, bool]]] | None:
+    if not isinstance(record, dict):
+        return None
+    if record.get("record_type") != RUN_RECORD_TYPE or record.get("version") != RUN_RECORD_VERSION:
+        return None
+    try:
+        topic = record["topic"]
+        stop_kind = record.get("stop_kind") or "unknown"
+        if not isinstance(topic, str) or not isinstance(stop_kind, str):
+            return None
+        calls = [
+            (
+                int(call["round"]),
+                str(call["kind"]),
+                str(call["role"]),
+                str(call["status"]),
+                int(call["elapsed_ms"]),
+                int(call["attempts"]),
+                int(call["response_chars"]),
+                bool(call.get("fallback")),
+            )
+            for call in record["calls"]
+        ]
+        return (
+            topic,
+            datetime.fromisoformat(record["started_at"]).timestamp(),
+            int(record["rounds"]),
+            stop_kind,
+            calls,
+        )
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def load_runs(paths: Iterable[Path], since: datetime | None = None) -> tuple[RunColumns, CallColumns]:
+    runs = RunColumns()
+    calls = CallColumns()
+    cutoff = since.timestamp() if since is not None else None
+
+    for path in _iter_record_paths(paths):
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        # 統計ファイルなど別種のJSONや、項目が欠けた・型が違う記録は読み飛ばす
+        parsed = _parse_record(record)
+        if parsed is None:
+            continue
+
+        topic, started_at, rounds, stop_kind, run_calls = parsed
+        if cutoff is not None and started_at < cutoff:
+            continue
+
+        run_index = len(runs)
+        runs.topic.append(runs.topics.encode(topic))
+        runs.started_at.append(started_at)
+        runs.rounds.append(rounds)
+        runs.stop_kind.append(runs.stop_kinds.encode(stop_kind))
+
+        for round_index, kind, role, status, elapsed_ms, attempts, response_chars, fallback in run_calls:
+            calls.run.append(run_index)
+            calls.round_index.append(round_index)
+            calls.kind.append(calls.kinds.encode(kind))
+            calls.role.append(calls.roles.encode(role))
+            calls.status.append(calls.statuses.encode(status))
+            calls.elapsed_ms.append(elapsed_ms)
+            calls.attempts.append(attempts)
+            calls.response_chars.append(response_chars)
+            calls.fallback.append(1 if fallback else 0)
+
+    return runs, calls
+
+
+def _percentile(sorted_values: list[int], q: float) -> int | None:
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _group_indices(codes: array, size: int) -> list[list[int]]:
+    groups: list[list[int]] = [[] for _ in range(size)]
+    for index, code in enumerate(codes):
+        groups[code].append(index)
+    return groups
+
+
+def _rate(count: int, total: int) -> float:
+    return round(count / total, 4) if total else 0.0
+
+
+def _call_stats(calls: CallColumns, indices: list[int]) -> dict[str, object]:
+    elapsed = sorted(calls.elapsed_ms[index] for index in indices)
+    sizes = sorted(calls.response_chars[index] for index in indices)
+    status_counts = [0] * len(calls.statuses.labels)
+    for index in indices:
+        status_counts[calls.status[index]] += 1
+    retries = sum(1 for index in indices if calls.attempts[index] > 1)
+
+    stats: dict[str, object] = {
+        "calls": len(indices),
+        "p50_ms": _percentile(elapsed, 0.5),
+        "p95_ms": _percentile(elapsed, 0.95),
+        "retry_rate": _rate(retries, len(indices)),
+        "response_chars_p50": _percentile(sizes, 0.5),
+        "response_chars_p95": _percentile(sizes, 0.95),
+    }
+    for code, label in enumerate(calls.statuses.labels):
+        if label != "ok":
+            stats[f"{label}_rate"] = _rate(status_counts[code], len(indices))
+    return stats
+
+
+def analyze(runs: RunColumns, calls: CallColumns) -> dict[str, object]:
+    rounds = sorted(runs.rounds)
+    stop_kind_groups = _group_indices(runs.stop_kind, len(runs.stop_kinds.labels))
+
+    rounds_until_stop: dict[str, dict[str, object]] = {}
+    moderator_code = (
+        runs.stop_kinds.labels.index("moderator") if "moderator" in runs.stop_kinds.labels else -1
+    )
+    topic_groups = _group_indices(runs.topic, len(runs.topics.labels))
+    for code, topic in enumerate(runs.topics.labels):
+        stopped = sorted(
+            runs.rounds[index]
+            for index in topic_groups[code]
+            if runs.stop_kind[index] == moderator_code
+        )
+        if stopped:
+            rounds_until_stop[topic] = {
+                "runs": len(stopped),
+                "mean_rounds": round(sum(stopped) / len(stopped), 2),
+                "p50_rounds": _percentile(stopped, 0.5),
+            }
+
+    kind_groups = _group_indices(calls.kind, len(calls.kinds.labels))
+    role_groups = _group_indices(calls.role, len(calls.roles.labels))
+    decision_indices = (
+        kind_groups[calls.kinds.labels.index("decision")] if "decision" in calls.kinds.labels else []
+    )
+    decision_rounds = {(calls.run[index], calls.round_index[index]) for index in decision_indices}
+    fallback_rounds = {
+        (calls.run[index], calls.round_index[index])
+        for index in decision_indices
+        if calls.fallback[index]
+    }
+
+    return {
+        "runs": len(runs),
+        "calls": len(calls),
+        "rounds": {
+            "mean": round(sum(rounds) / len(rounds), 2) if rounds else None,
+            "p50": _percentile(rounds, 0.5),
+            "p95": _percentile(rounds, 0.95),
+            "max": rounds[-1] if rounds else None,
+        },
+        "stop_kinds": {
+            label: len(stop_kind_groups[code]) for code, label in enumerate(runs.stop_kinds.labels)
+        },
+        "rounds_until_stop_by_topic": rounds_until_stop,
+        "by_kind": {
+            label: _call_stats(calls, kind_groups[code])
+            for code, label in enumerate(calls.kinds.labels)
+        },
+        "by_role": {
+            label: _call_stats(calls, role_groups[code])
+            for code, label in enumerate(calls.roles.labels)
+        },
+        "fallback_decision_rate": _rate(len(fallback_rounds), len(decision_rounds)),
+    }
+
+
+def _render_rows(title: str, rows: dict[str, dict[str, object]]) -> list[str]:
+    lines = [f"## {title}"]
+    if not rows:
+        return lines + ["（データなし）", ""]
+    columns: list[str] = []
+    for values in rows.values():
+        for column in values:
+            if column not in columns:
+                columns.append(column)
+    table = [["key", *columns]]
+    for key, values in rows.items():
+        cells = ["-" if values.get(column) is None else str(values[column]) for column in columns]
+        table.append([key, *cells])
+    widths = [max(len(row[index]) for row in table) for index in range(len(table[0]))]
+    for row in table:
+        lines.append("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+    return lines + [""]
+
+
+def render_table(report: dict[str, object]) -> str:
+    lines = [
+        f"runs: {report['runs']}  calls: {report['calls']}  "
+        f"fallback_decision_rate: {report['fallback_decision_rate']}",
+        "",
+    ]
+    lines += _render_rows("rounds", {"all": report["rounds"]})
+    stop_rows = {kind: {"runs": count} for kind, count in report["stop_kinds"].items()}
+    lines += _render_rows("stop_kinds", stop_rows)
+    lines += _render_rows("rounds_until_stop_by_topic", report["rounds_until_stop_by_topic"])
+    lines += _render_rows("by_kind", report["by_kind"])
+    lines += _render_rows("by_role", report["by_role"])
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="debate-orchestrator analytics",
+        description="保存済み討論の実行記録を横断集計する",
+    )
+    parser.add_argument("paths", nargs="+", type=Path, help="実行記録JSONまたはそのディレクトリ")
+    parser.add_argument("--since-days", type=float, default=None, help="直近N日の実行のみ集計")
+    parser.add_argument("--format", choices=("table", "json"), default="table", help="出力形式")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    since = None
+    if args.since_days is not None:
+        since = datetime.now(timezone.utc) - timedelta(days=args.since_days)
+
+    runs, calls = load_runs(args.paths, since=since)
+    report = analyze(runs, calls)
+    if args.format == "json":
+        sys.stdout.write(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+    else:
+        sys.stdout.write(render_table(report) + "\n")
+    return 0
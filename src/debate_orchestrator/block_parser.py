@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import re
+
+KEY_RE = re.compile(r"(NEXT_FOCUS|FOCUS|DECISION|REASON|CONFIDENCE):", flags=re.IGNORECASE)
+DECISION_VALUE_RE = re.compile(r"\s*(CONTINUE|STOP)", flags=re.IGNORECASE)
+CONFIDENCE_VALUE_RE = re.compile(r"\s*([0-9]*\.?[0-9]+)")
+DECISION_KEYS = ("DECISION", "REASON", "NEXT_FOCUS", "CONFIDENCE")
+
+
+@dataclass(frozen=True)
+class FocusBlock:
+    focus: str
+
+
+@dataclass(frozen=True)
+class DecisionBlock:
+    continue_debate: bool
+    reason: str
+    next_focus: str
+    confidence: float
+
+
+def _parse_confidence(raw_value: str) -> float:
+    try:
+        value = float(raw_value)
+    except ValueError:
+        return 0.5
+    return max(0.0, min(1.0, value))
+
+
+class ResponseBlockParser:
+    def __init__(self) -> None:
+        self._partial: list[str] = []
+        self._pending_key: str | None = None
+        self._pending_blank = False
+        # 判定ブロックは同じキーの再出現で区切り、最後に4項目が揃ったブロックを採用する
+        # 値は行末まで確定しないため、現在行の値は開始オフセット(int)で保持する
+        self._block: dict[str, str | int] = {}
+        self._completed: dict[str, str | int] | None = None
+        self._focus: str | int | None = None
+        self.first_line: str | None = None
+        self.focus: FocusBlock | None = None
+        self.decision: DecisionBlock | None = None
+        self.closed = False
+
+    def feed(self, chunk: str) -> list[FocusBlock | DecisionBlock]:
+        if self.closed:
+            raise ValueError("close 後は feed できません")
+        pieces = chunk.split("\n")
+        if len(pieces) == 1:
+            self._partial.append(chunk)
+            return []
+
+        blocks: list[FocusBlock | DecisionBlock] = []
+        self._partial.append(pieces[0])
+        blocks += self._finish_line("".join(self._partial))
+        for line in pieces[1:-1]:
+            blocks += self._finish_line(line)
+        self._partial = [pieces[-1]]
+        return blocks
+
+    def close(self) -> list[FocusBlock | DecisionBlock]:
+        if self.closed:
+            return []
+        line = "".join(self._partial)
+        self._partial = []
+        self.closed = True
+        blocks = self._finish_line(line)
+        if self._pending_key in ("REASON", "NEXT_FOCUS", "FOCUS") and self._pending_blank:
+            # 末尾のキーの後に空白しかない場合、正規表現はその空白1文字を値として一致していた
+            self._completed = None
+            self._set_field(self._pending_key, 0)
+            blocks += self._emit("")
+        self._pending_key = None
+        return blocks
+
+    def focus_or(self, default_focus: str) -> str:
+        if self.focus is not None:
+            return self.focus.focus
+        return self.first_line or default_focus
+
+    def _set_field(self, key: str, value: str | int) -> None:
+        if key == "FOCUS":
+            self._focus = value
+            return
+        if key in self._block:
+            self._block = {}
+        self._block[key] = value
+        if len(self._block) == len(DECISION_KEYS):
+            self._completed = dict(self._block)
+
+    def _accept(self, key: str, line: str, offset: int, content_end: int) -> None:
+        if offset >= content_end:
+            self._pending_key = key
+            self._pending_blank = offset < len(line)
+        elif key == "DECISION":
+            match = DECISION_VALUE_RE.match(line, offset)
+            if match:
+                self._set_field(key, match.group(1).upper())
+        elif key == "CONFIDENCE":
+            match = CONFIDENCE_VALUE_RE.match(line, offset)
+            if match:
+                self._set_field(key, match.group(1))
+        else:
+            self._set_field(key, offset)
+
+    def _finish_line(self, line: str) -> list[FocusBlock | DecisionBlock]:
+        stripped = line.strip()
+        if not stripped:
+            if line and self._pending_key is not None:
+                self._pending_blank = True
+            return []
+        if self.first_line is None:
+            self.first_line = stripped
+
+        self._completed = None
+        if self._pending_key is not None:
+            # キーの直後が空のときは、正規表現の \s* と同じく次の空でない行を値とみなす
+            key, self._pending_key = self._pending_key, None
+            self._accept(key, stripped, 0, len(stripped))
+
+        content_end = len(line.rstrip())
+        for match in KEY_RE.finditer(line):
+            self._accept(match.group(1).upper(), line, match.end(), content_end)
+        return self._emit(line)
+
+    def _emit(self, line: str) -> list[FocusBlock | DecisionBlock]:
+        def resolve(value: str | int) -> str:
+            return line[value:].strip() if isinstance(value, int) else value
+
+        blocks: list[FocusBlock | DecisionBlock] = []
+        self._block = {key: resolve(value) for key, value in self._block.items()}
+        if isinstance(self._focus, int):
+            self._focus = resolve(self._focus)
+            self.focus = FocusBlock(self._focus)
+            blocks.append(self.focus)
+        if self._completed is not None:
+            fields = {key: resolve(value) for key, value in self._completed.items()}
+            self.decision = DecisionBlock(
+                continue_debate=fields["DECISION"] == "CONTINUE",
+                reason=fields["REASON"],
+                next_focus=fields["NEXT_FOCUS"],
+                confidence=_parse_confidence(fields["CONFIDENCE"]),
+            )
+            blocks.append(self.decision)
+        return blocks
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+import threading
+from typing import TextIO
+
+from .config import DebateConfig
+from .debate_loop import DebateResult, RunnerProtocol, run_debate
+from .models import DebateState
+
+
+@dataclass(frozen=True)
+class DebateVariant:
+    name: str
+    focus: str | None = None
+    debater_count: int | None = None
+    max_rounds: int | None = None
+    perspectives: tuple[str, ...] | None = None
+
+    def apply(self, config: DebateConfig) -> DebateConfig:
+        debater_count = self.debater_count or config.debater_count
+        perspectives = self.perspectives
+        if perspectives is None:
+            perspectives = config.perspectives
+            if len(perspectives) >= debater_count:
+                perspectives = perspectives[:debater_count]
+        return replace(
+            config,
+            debater_count=debater_count,
+            max_rounds=self.max_rounds or config.max_rounds,
+            perspectives=perspectives,
+        ).validate()
+
+
+class _PrefixedStream:
+    def __init__(self, stream: TextIO, prefix: str, lock: threading.Lock) -> None:
+        self._stream = stream
+        self._prefix = prefix
+        self._lock = lock
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            return self._stream.write(f"{self._prefix} {text}")
+
+    def flush(self) -> None:
+        with self._lock:
+            self._stream.flush()
+
+
+def snapshot_state(state: DebateState, round_index: int) -> DebateState:
+    if not 0 <= round_index <= state.round_index:
+        raise ValueError(f"round_index は0〜{state.round_index}を指定してください")
+    # TurnMessage は追記後に変更されないため、ターン自体は分岐間で共有し、リストだけを複製する
+    return DebateState(
+        topic=state.topic,
+        round_index=round_index,
+        transcript=[turn for turn in state.transcript if turn.round_index <= round_index],
+    )
+
+
+def fork_debate(
+    config: DebateConfig,
+    runner: RunnerProtocol,
+    state: DebateState,
+    at_round: int,
+    variants: list[DebateVariant],
+    output_stream: TextIO | None = None,
+    runners: Mapping[str, RunnerProtocol] | None = None,
+) -> dict[str, DebateResult]:
+    if not variants:
+        raise ValueError("variants を1つ以上指定してください")
+    names = [variant.name for variant in variants]
+    if len(set(names)) != len(names):
+        raise ValueError("variant 名が重複しています")
+
+    prefix = snapshot_state(state, at_round)
+    branch_configs = [variant.apply(config) for variant in variants]
+    lock = threading.Lock()
+
+    with ThreadPoolExecutor(max_workers=len(variants)) as executor:
+        futures = {
+            variant.name: executor.submit(
+                run_debate,
+                config=branch_config,
+                runner=runner,
+                output_stream=(
+                    _PrefixedStream(output_stream, f"[branch {variant.name}]", lock)
+                    if output_stream is not None
+                    else None
+                ),
+                initial_state=DebateState(
+                    topic=prefix.topic,
+                    round_index=prefix.round_index,
+                    transcript=list(prefix.transcript),
+                ),
+                initial_focus=variant.focus,
+                runners=runners,
+            )
+            for variant, branch_config in zip(variants, branch_configs)
+        }
+        return {name: future.result() for name, future in futures.items()}
@@ -5,9 +5,13 @@ from datetime import datetime
 from pathlib import Path
 import sys
 
+from . import analytics
 from .agent_runner import AgentRunner
-from .config import DEFAULT_AGENT_CMD, DebateConfig, parse_bool
+from .config import DEFAULT_AGENT_CMD, DebateConfig, parse_bool, parse_routes
 from .debate_loop import run_debate
+from .run_record import build_run_record, save_run_record
+from .session_runner import SessionAgentRunner
+from .stats import LatencyStatsStore
 
 
 def build_default_output_path(base_dir: Path) -> Path:
@@ -20,12 +24,56 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--topic", required=True, help="討論テーマ")
     parser.add_argument("--max-rounds", type=int, default=6, help="最大ラウンド数")
     parser.add_argument("--max-minutes", type=int, default=20, help="最大実行分数")
-    parser.add_argument("--debater-count", type=int, default=3, help="議論者数 (2 or 3)")
+    parser.add_argument(
+        "--debater-count",
+        type=int,
+        default=None,
+        help="議論者数 (2〜12、未指定時は --perspective の数または3)",
+    )
+    parser.add_argument(
+        "--perspective",
+        action="append",
+        default=[],
+        help="議論者の観点 (指定順に debater_1 から割り当て、複数指定可)",
+    )
+    parser.add_argument(
+        "--group-size",
+        type=int,
+        default=3,
+        help="並列サブ討論1グループあたりの議論者数",
+    )
     parser.add_argument(
         "--agent-cmd",
         default=DEFAULT_AGENT_CMD,
         help="エージェント実行コマンド",
     )
+    parser.add_argument(
+        "--route",
+        action="append",
+        default=[],
+        metavar="KEY=CMD",
+        help="呼び出し種別 (focus/debater/digest/decision/final) または議論者 (debater_N) ごとのエージェント実行コマンド",
+    )
+    parser.add_argument(
+        "--route-timeout",
+        action="append",
+        default=[],
+        metavar="KEY=SEC",
+        help="呼び出し種別または議論者ごとのタイムアウト秒",
+    )
+    parser.add_argument(
+        "--route-retry",
+        action="append",
+        default=[],
+        metavar="KEY=N",
+        help="呼び出し種別または議論者ごとのリトライ回数",
+    )
+    parser.add_argument(
+        "--session-mode",
+        type=parse_bool,
+        default=False,
+        help="役割ごとに常駐セッションを保ち、2回目以降は前回以降の差分だけを送る (JSON Lines 対応エージェントが必要)",
+    )
     parser.add_argument("--show-live", type=parse_bool, default=True, help="逐次ログ表示")
     parser.add_argument("--output-file", type=Path, default=None, help="最終要約の保存先")
     parser.add_argument(
@@ -40,35 +88,124 @@ def build_parser() -> argparse.ArgumentParser:
         default=1,
         help="失敗時のリトライ回数",
     )
+    parser.add_argument(
+        "--max-agent-calls",
+        type=int,
+        default=None,
+        help="討論全体のエージェント呼び出し回数の上限",
+    )
+    parser.add_argument(
+        "--max-total-chars",
+        type=int,
+        default=None,
+        help="討論全体のプロンプト+応答文字数の上限",
+    )
+    parser.add_argument(
+        "--max-agent-cpu-sec",
+        type=float,
+        default=None,
+        help="討論全体のエージェントCPU秒の上限",
+    )
+    parser.add_argument(
+        "--max-response-bytes",
+        type=int,
+        default=None,
+        help="1回の応答として保持する標準出力の最大バイト数",
+    )
+    parser.add_argument(
+        "--spill-dir",
+        type=Path,
+        default=None,
+        help="上限超過分を含む全出力を退避する一時ファイルの保存先",
+    )
+    parser.add_argument(
+        "--quorum",
+        type=int,
+        default=None,
+        help="この人数の議論者が正常応答した時点で司会判定へ進む (未指定時は全員を待つ)",
+    )
+    parser.add_argument(
+        "--circuit-breaker-threshold",
+        type=int,
+        default=3,
+        help="恒久的な失敗がこの回数続いたらエージェント呼び出しを打ち切る",
+    )
+    parser.add_argument(
+        "--stats-file",
+        type=Path,
+        default=None,
+        help="実行ごとに更新する遅延統計ファイル (JSON)",
+    )
+    parser.add_argument(
+        "--stats-openmetrics",
+        type=Path,
+        default=None,
+        help="遅延統計をOpenMetrics形式で書き出す先",
+    )
     return parser
 
 
 def main(argv: list[str] | None = None) -> int:
+    arguments = sys.argv[1:] if argv is None else argv
+    if arguments and arguments[0] == "analytics":
+        return analytics.main(arguments[1:])
+
     parser = build_parser()
-    args = parser.parse_args(argv)
+    args = parser.parse_args(arguments)
+    debater_count = args.debater_count
+    if debater_count is None:
+        debater_count = len(args.perspective) or 3
 
     try:
         config = DebateConfig(
             topic=args.topic,
             max_rounds=args.max_rounds,
             max_minutes=args.max_minutes,
-            debater_count=args.debater_count,
+            debater_count=debater_count,
             agent_cmd=args.agent_cmd,
             show_live=args.show_live,
             output_file=args.output_file,
             agent_timeout_sec=args.agent_timeout_sec,
             retry_count=args.retry_count,
+            perspectives=tuple(args.perspective),
+            group_size=args.group_size,
+            max_agent_calls=args.max_agent_calls,
+            max_total_chars=args.max_total_chars,
+            max_agent_cpu_sec=args.max_agent_cpu_sec,
+            max_response_bytes=args.max_response_bytes,
+            spill_dir=args.spill_dir,
+            quorum=args.quorum,
+            circuit_breaker_threshold=args.circuit_breaker_threshold,
+            stats_file=args.stats_file,
+            stats_openmetrics_file=args.stats_openmetrics,
+            routes=parse_routes(args.route, args.route_timeout, args.route_retry),
+            session_mode=args.session_mode,
         ).validate()
     except ValueError as error:
         parser.error(str(error))
         return 2
 
-    runner = AgentRunner(config.agent_cmd)
-    result = run_debate(
-        config=config,
-        runner=runner,
-        output_stream=sys.stdout,
-    )
+    runner_class = SessionAgentRunner if config.session_mode else AgentRunner
+    runners = {
+        agent_cmd: runner_class(
+            agent_cmd,
+            max_response_bytes=config.max_response_bytes,
+            spill_dir=config.spill_dir,
+            circuit_breaker_threshold=config.circuit_breaker_threshold,
+        )
+        for agent_cmd in config.agent_commands()
+    }
+    try:
+        result = run_debate(
+            config=config,
+            runner=runners[config.agent_cmd],
+            output_stream=sys.stdout,
+            runners=runners,
+        )
+    finally:
+        for runner in runners.values():
+            if isinstance(runner, SessionAgentRunner):
+                runner.close()
 
     print("\n# 最終要約\n")
     print(result.summary_markdown)
@@ -77,6 +214,23 @@ def main(argv: list[str] | None = None) -> int:
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(result.summary_markdown, encoding="utf-8")
     print(f"保存先: {output_path}")
+    record_path = output_path.with_suffix(".json")
+    save_run_record(record_path, build_run_record(config, result))
+    print(f"実行記録: {record_path}")
+    usage = result.usage
+    print(
+        f"使用量: 呼び出し{usage.agent_calls}回 / "
+        f"文字数{usage.total_chars} (プロンプト{usage.prompt_chars}・応答{usage.response_chars}) / "
+        f"CPU{usage.cpu_seconds:.1f}秒 / プロンプト送信量{usage.prompt_bytes}バイト"
+    )
+
+    if config.stats_file is not None:
+        stats_store = LatencyStatsStore(config.stats_file)
+        stats_store.update(config.agent_cmd, result.state.calls)
+        print(f"遅延統計: {config.stats_file}")
+        if config.stats_openmetrics_file is not None:
+            stats_store.export_openmetrics(config.stats_openmetrics_file)
+            print(f"OpenMetrics: {config.stats_openmetrics_file}")
 
     return 0
 
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from .models import MAX_DEBATER_COUNT, MIN_DEBATER_COUNT, AgentRole, CallKind
+
 DEFAULT_AGENT_CMD = 'codex exec -c model_reasoning_effort="medium"'
 
 
+@dataclass(frozen=True)
+class AgentRoute:
+    agent_cmd: str | None = None
+    timeout_sec: int | None = None
+    retry_count: int | None = None
+
+
 @dataclass(frozen=True)
 class DebateConfig:
     topic: str
@@ -17,6 +27,43 @@ class DebateConfig:
     output_file: Path | None = None
     agent_timeout_sec: int = 120
     retry_count: int = 1
+    perspectives: tuple[str, ...] = ()
+    group_size: int = 3
+    max_agent_calls: int | None = None
+    max_total_chars: int | None = None
+    max_agent_cpu_sec: float | None = None
+    max_response_bytes: int | None = None
+    spill_dir: Path | None = None
+    quorum: int | None = None
+    circuit_breaker_threshold: int = 3
+    stats_file: Path | None = None
+    stats_openmetrics_file: Path | None = None
+    routes: Mapping[str, AgentRoute] = field(default_factory=dict)
+    session_mode: bool = False
+
+    def route_for(self, kind: CallKind, role: AgentRole) -> AgentRoute:
+        candidates = [self.routes.get(role.value), self.routes.get(kind.value)]
+        candidates = [route for route in candidates if route is not None]
+
+        def pick(attribute: str, default: object) -> object:
+            for route in candidates:
+                value = getattr(route, attribute)
+                if value is not None:
+                    return value
+            return default
+
+        return AgentRoute(
+            agent_cmd=pick("agent_cmd", self.agent_cmd),
+            timeout_sec=pick("timeout_sec", self.agent_timeout_sec),
+            retry_count=pick("retry_count", self.retry_count),
+        )
+
+    def agent_commands(self) -> list[str]:
+        commands = [self.agent_cmd]
+        for route in self.routes.values():
+            if route.agent_cmd is not None and route.agent_cmd not in commands:
+                commands.append(route.agent_cmd)
+        return commands
 
     def validate(self) -> "DebateConfig":
         if not self.topic.strip():
@@ -25,15 +72,82 @@ class DebateConfig:
             raise ValueError("--max-rounds は1以上を指定してください")
         if self.max_minutes < 1:
             raise ValueError("--max-minutes は1以上を指定してください")
-        if self.debater_count not in (2, 3):
-            raise ValueError("--debater-count は2または3を指定してください")
+        if not MIN_DEBATER_COUNT <= self.debater_count <= MAX_DEBATER_COUNT:
+            raise ValueError(
+                f"--debater-count は{MIN_DEBATER_COUNT}〜{MAX_DEBATER_COUNT}を指定してください"
+            )
+        if self.perspectives and len(self.perspectives) != self.debater_count:
+            raise ValueError("--perspective の指定数は議論者数と一致させてください")
+        if any(not perspective.strip() for perspective in self.perspectives):
+            raise ValueError("--perspective に空の観点は指定できません")
+        if self.group_size < 1:
+            raise ValueError("--group-size は1以上を指定してください")
+        if self.max_agent_calls is not None and self.max_agent_calls < 1:
+            raise ValueError("--max-agent-calls は1以上を指定してください")
+        if self.max_total_chars is not None and self.max_total_chars < 1:
+            raise ValueError("--max-total-chars は1以上を指定してください")
+        if self.max_agent_cpu_sec is not None and self.max_agent_cpu_sec <= 0:
+            raise ValueError("--max-agent-cpu-sec は0より大きい値を指定してください")
+        if self.max_response_bytes is not None and self.max_response_bytes < 1:
+            raise ValueError("--max-response-bytes は1以上を指定してください")
+        if self.spill_dir is not None and self.max_response_bytes is None:
+            raise ValueError("--spill-dir は --max-response-bytes と併せて指定してください")
+        if self.quorum is not None and not 1 <= self.quorum <= self.debater_count:
+            raise ValueError("--quorum は1以上かつ議論者数以下を指定してください")
+        if self.circuit_breaker_threshold < 1:
+            raise ValueError("--circuit-breaker-threshold は1以上を指定してください")
+        if self.stats_openmetrics_file is not None and self.stats_file is None:
+            raise ValueError("--stats-openmetrics は --stats-file と併せて指定してください")
         if self.agent_timeout_sec < 5:
             raise ValueError("--agent-timeout-sec は5以上を指定してください")
         if self.retry_count < 0:
             raise ValueError("--retry-count は0以上を指定してください")
+
+        route_keys = {kind.value for kind in CallKind}
+        route_keys.update(role.value for role in AgentRole.debaters(self.debater_count))
+        for key, route in self.routes.items():
+            if key not in route_keys:
+                raise ValueError(f"--route のキーが不正です: {key}")
+            if route.agent_cmd is not None and not route.agent_cmd.strip():
+                raise ValueError(f"--route {key} のコマンドが空です")
+            if route.timeout_sec is not None and route.timeout_sec < 5:
+                raise ValueError(f"--route-timeout {key} は5以上を指定してください")
+            if route.retry_count is not None and route.retry_count < 0:
+                raise ValueError(f"--route-retry {key} は0以上を指定してください")
         return self
 
 
+def _split_assignment(assignment: str, option: str) -> tuple[str, str]:
+    key, separator, value = assignment.partition("=")
+    if not separator or not key.strip():
+        raise ValueError(f"{option} は KEY=VALUE 形式で指定してください: {assignment}")
+    return key.strip(), value.strip()
+
+
+def parse_routes(
+    commands: list[str],
+    timeouts: list[str],
+    retries: list[str],
+) -> dict[str, AgentRoute]:
+    fields: dict[str, dict[str, object]] = {}
+    for assignment in commands:
+        key, value = _split_assignment(assignment, "--route")
+        fields.setdefault(key, {})["agent_cmd"] = value
+    for assignment in timeouts:
+        key, value = _split_assignment(assignment, "--route-timeout")
+        try:
+            fields.setdefault(key, {})["timeout_sec"] = int(value)
+        except ValueError:
+            raise ValueError(f"--route-timeout は整数秒で指定してください: {assignment}") from None
+    for assignment in retries:
+        key, value = _split_assignment(assignment, "--route-retry")
+        try:
+            fields.setdefault(key, {})["retry_count"] = int(value)
+        except ValueError:
+            raise ValueError(f"--route-retry は整数で指定してください: {assignment}") from None
+    return {key: AgentRoute(**values) for key, values in fields.items()}
+
+
 def parse_bool(value: str) -> bool:
     normalized = value.strip().lower()
     if normalized in {"1", "true", "t", "yes", "y", "on"}:
@@ -1,28 +1,48 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 import io
-import re
+import queue
+import threading
+import time
 from typing import Protocol, TextIO
+import uuid
 
 from .agent_runner import AgentCallResult
+from .block_parser import DecisionBlock, ResponseBlockParser
 from .config import DebateConfig
-from .models import AgentRole, DebateState, ModeratorDecision, TurnMessage, TurnStatus
+from .models import (
+    AgentRole,
+    CallKind,
+    CancelledCall,
+    CallRecord,
+    DebateState,
+    DebateUsage,
+    ModeratorDecision,
+    PlanRecord,
+    PlanTarget,
+    StopKind,
+    TurnMessage,
+    TurnStatus,
+)
+from .planner import predict_final_ms, predict_round_ms
 from .prompts import (
+    build_debater_delta_prompt,
     build_debater_prompt,
+    build_final_summary_delta_prompt,
     build_final_summary_prompt,
+    build_group_digest_prompt,
+    build_moderator_decision_delta_prompt,
     build_moderator_decision_prompt,
+    build_moderator_focus_delta_prompt,
     build_moderator_focus_prompt,
 )
 
-DECISION_RE = re.compile(r"DECISION:\s*(CONTINUE|STOP)", flags=re.IGNORECASE)
-REASON_RE = re.compile(r"REASON:\s*(.+)", flags=re.IGNORECASE)
-NEXT_FOCUS_RE = re.compile(r"NEXT_FOCUS:\s*(.+)", flags=re.IGNORECASE)
-CONFIDENCE_RE = re.compile(r"CONFIDENCE:\s*([0-9]*\.?[0-9]+)", flags=re.IGNORECASE)
-FOCUS_RE = re.compile(r"FOCUS:\s*(.+)", flags=re.IGNORECASE)
-
 FALLBACK_DECISION_REASON = "司会判定ブロック欠落のため安全側で継続"
+DECISION_RETRY_INSTRUCTION = "必ず判定ブロック4行を正確に出力してください。"
 
 
 class RunnerProtocol(Protocol):
@@ -35,34 +55,130 @@ class DebateResult:
     summary_markdown: str
     state: DebateState
 
+    @property
+    def usage(self) -> DebateUsage:
+        return self.state.usage
 
-def parse_focus(response: str, default_focus: str) -> str:
-    focus_match = FOCUS_RE.search(response)
-    if focus_match:
-        return focus_match.group(1).strip()
 
-    for line in response.splitlines():
-        cleaned = line.strip()
-        if cleaned:
-            return cleaned
-    return default_focus
+class _AgentRouter:
+    def __init__(
+        self,
+        config: DebateConfig,
+        runner: RunnerProtocol,
+        runners: Mapping[str, RunnerProtocol] | None = None,
+    ) -> None:
+        self._config = config
+        self._runners = {config.agent_cmd: runner, **(runners or {})}
+        missing = [command for command in config.agent_commands() if command not in self._runners]
+        if missing:
+            raise ValueError(f"ルーティング先のランナーが指定されていません: {', '.join(missing)}")
+        self._session_prefix = uuid.uuid4().hex
+        self._session_keys: set[str] = set()
+        # セッションはコマンドと役割の組ごとに持つため、既読のターンも同じ単位で追跡する
+        self._seen_turns: dict[tuple[str, AgentRole], set[int]] = {}
+        self._lock = threading.Lock()
 
+    def _session_owner(self, kind: CallKind, role: AgentRole) -> tuple[str, AgentRole]:
+        return self._config.route_for(kind, role).agent_cmd, role
 
-def _parse_confidence(raw_value: str) -> float:
-    try:
-        value = float(raw_value)
-    except ValueError:
-        return 0.5
-    return max(0.0, min(1.0, value))
+    def new_turns(
+        self,
+        kind: CallKind,
+        role: AgentRole,
+        transcript: list[TurnMessage],
+        exclude: list[TurnMessage] | None = None,
+    ) -> list[TurnMessage] | None:
+        if not self._config.session_mode:
+            return None
+        owner = self._session_owner(kind, role)
+        with self._lock:
+            seen = self._seen_turns.get(owner)
+            self._seen_turns[owner] = {id(turn) for turn in transcript}
+        if seen is None:
+            return None
+        excluded = {id(turn) for turn in exclude or []}
+        return [turn for turn in transcript if id(turn) not in seen and id(turn) not in excluded]
 
+    def mark_seen(self, kind: CallKind, role: AgentRole, turn: TurnMessage) -> None:
+        if not self._config.session_mode:
+            return
+        with self._lock:
+            self._seen_turns.setdefault(self._session_owner(kind, role), set()).add(id(turn))
 
-def parse_moderator_decision(response: str, fallback_focus: str) -> ModeratorDecision:
-    decision_match = DECISION_RE.search(response)
-    reason_match = REASON_RE.search(response)
-    next_focus_match = NEXT_FOCUS_RE.search(response)
-    confidence_match = CONFIDENCE_RE.search(response)
+    def ask(
+        self,
+        kind: CallKind,
+        role: AgentRole,
+        prompt: str,
+        retry_count: int | None = None,
+        delta_prompt: str | None = None,
+    ) -> AgentCallResult:
+        route = self._config.route_for(kind, role)
+        runner = self._runners[route.agent_cmd]
+        retry_count = route.retry_count if retry_count is None else retry_count
+        ask_session = getattr(runner, "ask_session", None)
+        if self._config.session_mode and ask_session is not None and kind != CallKind.DIGEST:
+            session_key = f"{self._session_prefix}:{route.agent_cmd}:{role.value}"
+            with self._lock:
+                self._session_keys.add(session_key)
+            return ask_session(
+                session_key=session_key,
+                prompt=prompt,
+                timeout_sec=route.timeout_sec,
+                retry_count=retry_count,
+                delta_prompt=delta_prompt,
+            )
+        return runner.ask(prompt=prompt, timeout_sec=route.timeout_sec, retry_count=retry_count)
+
+    def close(self) -> None:
+        with self._lock:
+            session_keys = sorted(self._session_keys)
+            self._session_keys.clear()
+        runners = {id(runner): runner for runner in self._runners.values()}
+        for runner in runners.values():
+            end_session = getattr(runner, "end_session", None)
+            if end_session is not None:
+                for session_key in session_keys:
+                    end_session(session_key)
+
+
+@dataclass
+class _DebaterEvent:
+    group_index: int
+    position: int
+    prompt: str
+    result: AgentCallResult | None = None
+    turn: TurnMessage | None = None
+    is_digest: bool = False
+    error: BaseException | None = None
+    cancelled: CancelledCall | None = None
+
+
+@dataclass
+class _DebaterPhase:
+    round_index: int
+    events: queue.Queue[_DebaterEvent]
+    remaining: int
+    executor: ThreadPoolExecutor
+    groups: list[list[tuple[AgentRole, str | None]]]
+    collected: list[_DebaterEvent] = field(default_factory=list)
+    received: set[tuple[int, int]] = field(default_factory=set)
+    cancelled: threading.Event = field(default_factory=threading.Event)
 
-    if not all([decision_match, reason_match, next_focus_match, confidence_match]):
+
+def _parse_blocks(response: str) -> ResponseBlockParser:
+    parser = ResponseBlockParser()
+    parser.feed(response)
+    parser.close()
+    return parser
+
+
+def parse_focus(response: str, default_focus: str) -> str:
+    return _parse_blocks(response).focus_or(default_focus)
+
+
+def decision_from_block(block: DecisionBlock | None, fallback_focus: str) -> ModeratorDecision:
+    if block is None:
         return ModeratorDecision(
             continue_debate=True,
             reason=FALLBACK_DECISION_REASON,
@@ -70,38 +186,160 @@ def parse_moderator_decision(response: str, fallback_focus: str) -> ModeratorDec
             next_focus=fallback_focus,
         )
 
-    decision_token = decision_match.group(1).upper()
-    continue_debate = decision_token == "CONTINUE"
-    reason = reason_match.group(1).strip()
-    next_focus = next_focus_match.group(1).strip() or fallback_focus
-    confidence = _parse_confidence(confidence_match.group(1))
-
     return ModeratorDecision(
-        continue_debate=continue_debate,
-        reason=reason,
-        confidence=confidence,
-        next_focus=next_focus,
+        continue_debate=block.continue_debate,
+        reason=block.reason,
+        confidence=block.confidence,
+        next_focus=block.next_focus or fallback_focus,
     )
 
 
-def should_stop(
+def parse_moderator_decision(response: str, fallback_focus: str) -> ModeratorDecision:
+    return decision_from_block(_parse_blocks(response).decision, fallback_focus)
+
+
+def _count_digest_calls(groups: list[list[tuple[AgentRole, str | None]]]) -> int:
+    if len(groups) < 2:
+        return 0
+    return sum(1 for members in groups if len(members) > 1)
+
+
+def _estimate_round_calls(config: DebateConfig) -> int:
+    digest_calls = _count_digest_calls(_split_debater_groups(config))
+    return 1 + config.debater_count + digest_calls + 1
+
+
+def _check_budgets(state: DebateState, config: DebateConfig) -> str:
+    usage = state.usage
+    required_calls = _estimate_round_calls(config) + 1
+
+    if (
+        config.max_agent_calls is not None
+        and usage.agent_calls + required_calls > config.max_agent_calls
+    ):
+        return f"エージェント呼び出し予算({config.max_agent_calls}回)では次ラウンドと最終要約を賄えない"
+
+    if usage.agent_calls == 0:
+        return ""
+
+    if config.max_total_chars is not None:
+        chars_per_call = usage.total_chars / usage.agent_calls
+        if usage.total_chars + chars_per_call * required_calls > config.max_total_chars:
+            return f"文字数予算({config.max_total_chars}文字)では次ラウンドと最終要約を賄えない"
+
+    if config.max_agent_cpu_sec is not None:
+        cpu_per_call = usage.cpu_seconds / usage.agent_calls
+        if usage.cpu_seconds + cpu_per_call * required_calls > config.max_agent_cpu_sec:
+            return f"CPU時間予算({config.max_agent_cpu_sec:g}秒)では次ラウンドと最終要約を賄えない"
+
+    return ""
+
+
+def _predict_round_ms(state: DebateState, config: DebateConfig) -> int | None:
+    groups = _split_debater_groups(config)
+    return predict_round_ms(
+        state.calls,
+        [len(members) for members in groups],
+        condensed=len(groups) > 1,
+    )
+
+
+def _check_time_plan(state: DebateState, config: DebateConfig, now: datetime) -> str:
+    if state.deadline_at is None:
+        return ""
+    round_ms = _predict_round_ms(state, config)
+    final_ms = predict_final_ms(state.calls)
+    if round_ms is None or final_ms is None:
+        return ""
+
+    remaining_ms = (state.deadline_at - now).total_seconds() * 1000
+    if round_ms + final_ms > remaining_ms:
+        return (
+            f"残り時間({remaining_ms / 1000:.0f}秒)では次ラウンド(予測{round_ms / 1000:.1f}秒)"
+            f"と最終要約(予測{final_ms / 1000:.1f}秒)を完了できない"
+        )
+    return ""
+
+
+def _evaluate_stop(
     state: DebateState,
     config: DebateConfig,
     last_decision: ModeratorDecision | None,
     now: datetime | None = None,
-) -> tuple[bool, str]:
+) -> tuple[StopKind | None, str]:
     current_time = now or datetime.now(timezone.utc)
 
+    if state.abort_reason:
+        return StopKind.ABORTED, state.abort_reason
+
     if last_decision is not None and not last_decision.continue_debate:
-        return True, last_decision.reason or "司会判定により終了"
+        return StopKind.MODERATOR, last_decision.reason or "司会判定により終了"
 
     if state.round_index >= config.max_rounds:
-        return True, f"最大ラウンド数({config.max_rounds})に到達"
+        return StopKind.MAX_ROUNDS, f"最大ラウンド数({config.max_rounds})に到達"
 
     if state.deadline_at is not None and current_time >= state.deadline_at:
-        return True, f"最大時間({config.max_minutes}分)に到達"
+        return StopKind.DEADLINE, f"最大時間({config.max_minutes}分)に到達"
+
+    plan_reason = _check_time_plan(state, config, current_time)
+    if plan_reason:
+        return StopKind.DEADLINE, plan_reason
 
-    return False, ""
+    budget_reason = _check_budgets(state, config)
+    if budget_reason:
+        return StopKind.BUDGET, budget_reason
+
+    return None, ""
+
+
+def should_stop(
+    state: DebateState,
+    config: DebateConfig,
+    last_decision: ModeratorDecision | None,
+    now: datetime | None = None,
+) -> tuple[bool, str]:
+    stop_kind, reason = _evaluate_stop(state, config, last_decision, now)
+    return stop_kind is not None, reason
+
+
+def _record_call(
+    state: DebateState,
+    config: DebateConfig,
+    kind: CallKind,
+    role: AgentRole,
+    round_index: int,
+    prompt: str,
+    result: AgentCallResult,
+    fallback: bool = False,
+) -> None:
+    # セッションモードでは差分だけを送るため、実際に送った本文で数える
+    sent_prompt = prompt if result.sent_prompt is None else result.sent_prompt
+    prompt_bytes = result.prompt_bytes or len(sent_prompt.encode("utf-8")) * result.attempts
+    state.calls.append(
+        CallRecord(
+            kind=kind,
+            role=role,
+            agent_cmd=config.route_for(kind, role).agent_cmd,
+            round_index=round_index,
+            status=result.status,
+            elapsed_ms=result.elapsed_ms,
+            attempts=result.attempts,
+            prompt_chars=len(sent_prompt),
+            response_chars=len(result.response),
+            fallback=fallback,
+            prompt_bytes=prompt_bytes,
+            wall_ms=result.wall_ms or result.elapsed_ms,
+        )
+    )
+    state.usage.record(
+        prompt_chars=len(sent_prompt),
+        response_chars=len(result.response),
+        attempts=result.attempts,
+        cpu_seconds=result.cpu_ms / 1000,
+        prompt_bytes=prompt_bytes,
+    )
+    if result.circuit_open and not state.abort_reason:
+        state.abort_reason = f"エージェントコマンドの恒久的な失敗が続いたため中断: {result.error}"
 
 
 def _render_live_line(stream: TextIO, line: str) -> None:
@@ -109,8 +347,7 @@ def _render_live_line(stream: TextIO, line: str) -> None:
     stream.flush()
 
 
-def _append_turn(
-    state: DebateState,
+def _build_turn(
     role: AgentRole,
     round_index: int,
     prompt: str,
@@ -125,18 +362,323 @@ def _append_turn(
         else:
             response = "（空応答）"
 
-    turn = TurnMessage(
+    return TurnMessage(
         role=role,
         round_index=round_index,
         prompt=prompt,
         response=response,
         elapsed_ms=result.elapsed_ms,
         status=result.status,
+        truncated=result.truncated,
+        spill_path=result.spill_path,
     )
+
+
+def _append_turn(
+    state: DebateState,
+    role: AgentRole,
+    round_index: int,
+    prompt: str,
+    result: AgentCallResult,
+) -> TurnMessage:
+    turn = _build_turn(role=role, round_index=round_index, prompt=prompt, result=result)
     state.transcript.append(turn)
     return turn
 
 
+def _split_debater_groups(
+    config: DebateConfig,
+) -> list[list[tuple[AgentRole, str | None]]]:
+    members: list[tuple[AgentRole, str | None]] = []
+    for index, role in enumerate(AgentRole.debaters(config.debater_count)):
+        perspective = config.perspectives[index] if config.perspectives else None
+        members.append((role, perspective))
+    return [
+        members[start : start + config.group_size]
+        for start in range(0, len(members), config.group_size)
+    ]
+
+
+def _run_debater_group(
+    router: _AgentRouter,
+    config: DebateConfig,
+    round_index: int,
+    focus: str,
+    history: list[TurnMessage],
+    group_index: int,
+    members: list[tuple[AgentRole, str | None]],
+    condense: bool,
+    events: queue.Queue[_DebaterEvent],
+    cancelled: threading.Event,
+) -> None:
+    def cancel_from(position: int) -> None:
+        for skipped, (role, _) in enumerate(members[position:], start=position):
+            events.put(
+                _DebaterEvent(
+                    group_index=group_index,
+                    position=skipped,
+                    prompt="",
+                    cancelled=CancelledCall(CallKind.DEBATER, role, round_index),
+                )
+            )
+        if condense:
+            events.put(
+                _DebaterEvent(
+                    group_index=group_index,
+                    position=len(members),
+                    prompt="",
+                    is_digest=True,
+                    cancelled=CancelledCall(CallKind.DIGEST, AgentRole.MODERATOR, round_index),
+                )
+            )
+
+    turns: list[TurnMessage] = []
+    try:
+        for position, (role, perspective) in enumerate(members):
+            if cancelled.is_set():
+                cancel_from(position)
+                return
+            debater_prompt = build_debater_prompt(
+                role=role,
+                topic=config.topic,
+                round_index=round_index,
+                focus=focus,
+                transcript=history + turns,
+                perspective=perspective,
+            )
+            new_turns = router.new_turns(CallKind.DEBATER, role, history + turns)
+            debater_result = router.ask(
+                CallKind.DEBATER,
+                role,
+                debater_prompt,
+                delta_prompt=(
+                    build_debater_delta_prompt(round_index, focus, new_turns)
+                    if new_turns is not None
+                    else None
+                ),
+            )
+            debater_turn = _build_turn(
+                role=role,
+                round_index=round_index,
+                prompt=debater_prompt,
+                result=debater_result,
+            )
+            router.mark_seen(CallKind.DEBATER, role, debater_turn)
+            turns.append(debater_turn)
+            events.put(
+                _DebaterEvent(
+                    group_index=group_index,
+                    position=position,
+                    prompt=debater_prompt,
+                    result=debater_result,
+                    turn=debater_turn,
+                )
+            )
+
+        if condense and cancelled.is_set():
+            cancel_from(len(members))
+        elif condense:
+            digest_prompt = build_group_digest_prompt(
+                topic=config.topic,
+                round_index=round_index,
+                focus=focus,
+                group_index=group_index,
+                debater_messages=turns,
+            )
+            digest_result = router.ask(CallKind.DIGEST, AgentRole.MODERATOR, digest_prompt)
+            events.put(
+                _DebaterEvent(
+                    group_index=group_index,
+                    position=len(members),
+                    prompt=digest_prompt,
+                    result=digest_result,
+                    turn=_build_turn(
+                        role=AgentRole.MODERATOR,
+                        round_index=round_index,
+                        prompt=digest_prompt,
+                        result=digest_result,
+                    ),
+                    is_digest=True,
+                )
+            )
+    except BaseException as error:
+        events.put(_DebaterEvent(group_index=group_index, position=-1, prompt="", error=error))
+        raise
+
+
+def _start_debater_phase(
+    router: _AgentRouter,
+    config: DebateConfig,
+    round_index: int,
+    focus: str,
+    history: list[TurnMessage],
+    groups: list[list[tuple[AgentRole, str | None]]],
+) -> _DebaterPhase:
+    condense = len(groups) > 1
+    phase = _DebaterPhase(
+        round_index=round_index,
+        events=queue.Queue(),
+        remaining=config.debater_count + _count_digest_calls(groups),
+        executor=ThreadPoolExecutor(max_workers=len(groups)),
+        groups=groups,
+    )
+    for group_index, members in enumerate(groups, start=1):
+        phase.executor.submit(
+            _run_debater_group,
+            router,
+            config,
+            round_index,
+            focus,
+            history,
+            group_index,
+            members,
+            condense and len(members) > 1,
+            phase.events,
+            phase.cancelled,
+        )
+    phase.executor.shutdown(wait=False)
+    return phase
+
+
+def _receive_debater_event(
+    phase: _DebaterPhase,
+    block: bool,
+    timeout: float | None = None,
+) -> _DebaterEvent | None:
+    try:
+        event = phase.events.get(block=block, timeout=timeout)
+    except queue.Empty:
+        return None
+    if event.error is not None:
+        raise event.error
+    phase.remaining -= 1
+    phase.received.add((event.group_index, event.position))
+    phase.collected.append(event)
+    return event
+
+
+def _unfinished_calls(phase: _DebaterPhase) -> list[CancelledCall]:
+    condense = len(phase.groups) > 1
+    calls: list[CancelledCall] = []
+    for group_index, members in enumerate(phase.groups, start=1):
+        expected = [(CallKind.DEBATER, role) for role, _ in members]
+        if condense and len(members) > 1:
+            expected.append((CallKind.DIGEST, AgentRole.MODERATOR))
+        # グループ内は順に実行されるため、最初の未着信だけが実行中でそれ以降は未着手
+        in_flight = True
+        for position, (kind, role) in enumerate(expected):
+            if (group_index, position) in phase.received:
+                continue
+            calls.append(CancelledCall(kind, role, phase.round_index, abandoned=in_flight))
+            in_flight = False
+    return calls
+
+
+def _wait_for_quorum(phase: _DebaterPhase, quorum: int | None) -> None:
+    ok_count = 0
+    while phase.remaining > 0:
+        if quorum is not None and ok_count >= quorum:
+            return
+        event = _receive_debater_event(phase, block=True)
+        if not event.is_digest and event.turn.status == TurnStatus.OK:
+            ok_count += 1
+
+
+def _take_collected(phase: _DebaterPhase) -> list[_DebaterEvent]:
+    collected = sorted(phase.collected, key=lambda event: (event.group_index, event.position))
+    phase.collected = []
+    return collected
+
+
+def _record_cancelled(
+    state: DebateState,
+    config: DebateConfig,
+    call: CancelledCall,
+    label: str,
+    live_stream: TextIO,
+) -> None:
+    state.cancelled_calls.append(call)
+    if config.show_live:
+        action = "abandoned" if call.abandoned else "cancelled"
+        _render_live_line(live_stream, f"[round {call.round_index}] {action} {label}")
+
+
+def _drain_late_phases(
+    state: DebateState,
+    config: DebateConfig,
+    pending: list[_DebaterPhase],
+    live_stream: TextIO,
+    wait_sec: float | None = None,
+) -> list[_DebaterPhase]:
+    # wait_sec を指定した場合は未着手の呼び出しを取り消し、実行中の呼び出しをその秒数まで待つ
+    wait_until = None if wait_sec is None else time.monotonic() + wait_sec
+    still_pending: list[_DebaterPhase] = []
+    for phase in pending:
+        if wait_until is not None:
+            phase.cancelled.set()
+        while phase.remaining > 0:
+            timeout = None if wait_until is None else wait_until - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                break
+            if _receive_debater_event(phase, block=wait_until is not None, timeout=timeout) is None:
+                break
+        for event in _take_collected(phase):
+            if event.cancelled is not None:
+                label = (
+                    f"group_{event.group_index} digest"
+                    if event.is_digest
+                    else event.cancelled.role.value
+                )
+                _record_cancelled(state, config, event.cancelled, label, live_stream)
+                continue
+            _record_call(
+                state,
+                config,
+                CallKind.DIGEST if event.is_digest else CallKind.DEBATER,
+                event.turn.role,
+                event.turn.round_index,
+                event.prompt,
+                event.result,
+            )
+            state.transcript.append(event.turn)
+            if config.show_live:
+                label = f"group_{event.group_index} digest" if event.is_digest else event.turn.role.value
+                _render_live_line(
+                    live_stream,
+                    f"[round {phase.round_index}] late {label}: {_format_turn_snippet(event.turn)}",
+                )
+        if phase.remaining > 0 and wait_until is not None:
+            for call in _unfinished_calls(phase):
+                label = "digest" if call.kind == CallKind.DIGEST else call.role.value
+                _record_cancelled(state, config, call, label, live_stream)
+        elif phase.remaining > 0:
+            still_pending.append(phase)
+    return still_pending
+
+
+def _with_group_index(
+    turns: list[TurnMessage],
+    groups: list[list[tuple[AgentRole, str | None]]],
+) -> list[tuple[TurnMessage, int]]:
+    group_by_role = {
+        role: group_index
+        for group_index, members in enumerate(groups, start=1)
+        for role, _ in members
+    }
+    return [(turn, group_by_role[turn.role]) for turn in turns]
+
+
+def _format_plan(plan: PlanRecord) -> str:
+    def seconds(value: int | None) -> str:
+        return "-" if value is None else f"{value / 1000:.1f}s"
+
+    return f"planner predicted={seconds(plan.predicted_ms)} actual={seconds(plan.actual_ms)}"
+
+
+def _finish_plan(plan: PlanRecord, started: float) -> None:
+    plan.actual_ms = int((time.monotonic() - started) * 1000)
+
+
 def _format_live_snippet(text: str, width: int = 120) -> str:
     normalized = " ".join(text.split())
     if len(normalized) > width:
@@ -144,6 +686,13 @@ def _format_live_snippet(text: str, width: int = 120) -> str:
     return normalized
 
 
+def _format_turn_snippet(turn: TurnMessage) -> str:
+    snippet = _format_live_snippet(turn.response)
+    if turn.truncated:
+        snippet += " [truncated]"
+    return snippet
+
+
 def _build_fallback_summary(state: DebateState) -> str:
     total_turns = len(state.transcript)
     return (
@@ -184,112 +733,228 @@ def run_debate(
     config: DebateConfig,
     runner: RunnerProtocol,
     output_stream: TextIO | None = None,
+    initial_state: DebateState | None = None,
+    initial_focus: str | None = None,
+    runners: Mapping[str, RunnerProtocol] | None = None,
 ) -> DebateResult:
     config.validate()
+    router = _AgentRouter(config, runner, runners)
 
     started_at = datetime.now(timezone.utc)
-    state = DebateState(
-        topic=config.topic,
-        round_index=0,
-        transcript=[],
-        started_at=started_at,
-        deadline_at=started_at + timedelta(minutes=config.max_minutes),
-    )
+    if initial_state is None:
+        state = DebateState(topic=config.topic, round_index=0, transcript=[])
+    else:
+        state = initial_state
+    state.started_at = started_at
+    state.deadline_at = started_at + timedelta(minutes=config.max_minutes)
 
     live_stream: TextIO = output_stream if output_stream is not None else io.StringIO()
-    current_focus = config.topic
+    current_focus = initial_focus or config.topic
+    pinned_focus = initial_focus
     last_decision: ModeratorDecision | None = None
+    debater_groups = _split_debater_groups(config)
+    pending_phases: list[_DebaterPhase] = []
 
     while True:
-        stop_now, reason = should_stop(state, config, last_decision)
-        if stop_now:
+        pending_phases = _drain_late_phases(state, config, pending_phases, live_stream)
+        stop_kind, reason = _evaluate_stop(state, config, last_decision)
+        if stop_kind is not None:
+            state.stop_kind = stop_kind
             state.stop_reason = reason
             break
 
         state.round_index += 1
         round_index = state.round_index
+        round_plan = PlanRecord(PlanTarget.ROUND, round_index, _predict_round_ms(state, config))
+        state.plans.append(round_plan)
+        round_started = time.monotonic()
 
-        focus_prompt = build_moderator_focus_prompt(config.topic, round_index, state.transcript)
-        focus_result = runner.ask(
-            prompt=focus_prompt,
-            timeout_sec=config.agent_timeout_sec,
-            retry_count=config.retry_count,
-        )
-        focus_turn = _append_turn(
-            state=state,
-            role=AgentRole.MODERATOR,
-            round_index=round_index,
-            prompt=focus_prompt,
-            result=focus_result,
-        )
-        current_focus = parse_focus(focus_turn.response, current_focus)
-
-        if config.show_live:
-            _render_live_line(
-                live_stream,
-                f"[round {round_index}] moderator focus: {_format_live_snippet(current_focus)}",
-            )
-
-        debater_turns: list[TurnMessage] = []
-        for role in AgentRole.debaters(config.debater_count):
-            debater_prompt = build_debater_prompt(
-                role=role,
-                topic=config.topic,
-                round_index=round_index,
-                focus=current_focus,
-                transcript=state.transcript,
+        if pinned_focus:
+            current_focus = pinned_focus
+            pinned_focus = None
+            if config.show_live:
+                _render_live_line(
+                    live_stream,
+                    f"[round {round_index}] moderator focus (override): "
+                    f"{_format_live_snippet(current_focus)}",
+                )
+        else:
+            focus_prompt = build_moderator_focus_prompt(config.topic, round_index, state.transcript)
+            new_turns = router.new_turns(CallKind.FOCUS, AgentRole.MODERATOR, state.transcript)
+            focus_result = router.ask(
+                CallKind.FOCUS,
+                AgentRole.MODERATOR,
+                focus_prompt,
+                delta_prompt=(
+                    build_moderator_focus_delta_prompt(round_index, new_turns)
+                    if new_turns is not None
+                    else None
+                ),
             )
-            debater_result = runner.ask(
-                prompt=debater_prompt,
-                timeout_sec=config.agent_timeout_sec,
-                retry_count=config.retry_count,
+            _record_call(
+                state,
+                config,
+                CallKind.FOCUS,
+                AgentRole.MODERATOR,
+                round_index,
+                focus_prompt,
+                focus_result,
             )
-            debater_turn = _append_turn(
+            focus_turn = _append_turn(
                 state=state,
-                role=role,
+                role=AgentRole.MODERATOR,
                 round_index=round_index,
-                prompt=debater_prompt,
-                result=debater_result,
+                prompt=focus_prompt,
+                result=focus_result,
             )
-            debater_turns.append(debater_turn)
+            router.mark_seen(CallKind.FOCUS, AgentRole.MODERATOR, focus_turn)
+            if state.abort_reason:
+                state.stop_kind = StopKind.ABORTED
+                state.stop_reason = state.abort_reason
+                _finish_plan(round_plan, round_started)
+                break
+            current_focus = parse_focus(focus_turn.response, current_focus)
 
             if config.show_live:
                 _render_live_line(
                     live_stream,
-                    f"[round {round_index}] {role.value}: {_format_live_snippet(debater_turn.response)}",
+                    f"[round {round_index}] moderator focus: {_format_live_snippet(current_focus)}",
                 )
 
+        phase = _start_debater_phase(
+            router=router,
+            config=config,
+            round_index=round_index,
+            focus=current_focus,
+            history=list(state.transcript),
+            groups=debater_groups,
+        )
+        _wait_for_quorum(phase, config.quorum)
+
+        debater_turns: list[TurnMessage] = []
+        digest_turns: list[TurnMessage] = []
+        group_digests: list[tuple[int, str]] = []
+        answered_roles: set[AgentRole] = set()
+        for event in _take_collected(phase):
+            _record_call(
+                state,
+                config,
+                CallKind.DIGEST if event.is_digest else CallKind.DEBATER,
+                event.turn.role,
+                event.turn.round_index,
+                event.prompt,
+                event.result,
+            )
+            state.transcript.append(event.turn)
+            if event.is_digest:
+                digest_turns.append(event.turn)
+                group_digests.append((event.group_index, event.turn.response))
+                label = f"group_{event.group_index} digest"
+            else:
+                debater_turns.append(event.turn)
+                answered_roles.add(event.turn.role)
+                label = event.turn.role.value
+            if config.show_live:
+                _render_live_line(
+                    live_stream,
+                    f"[round {round_index}] {label}: {_format_turn_snippet(event.turn)}",
+                )
+
+        digested_groups = {group_index for group_index, _ in group_digests}
+        undigested_turns = [
+            turn
+            for turn, group_index in _with_group_index(debater_turns, debater_groups)
+            if group_index not in digested_groups
+        ]
+        missing_roles = [
+            role
+            for members in debater_groups
+            for role, _ in members
+            if role not in answered_roles
+        ]
+        if phase.remaining > 0:
+            pending_phases.append(phase)
+        if state.abort_reason:
+            state.stop_kind = StopKind.ABORTED
+            state.stop_reason = state.abort_reason
+            _finish_plan(round_plan, round_started)
+            break
+
         decision_prompt = build_moderator_decision_prompt(
             topic=config.topic,
             round_index=round_index,
             focus=current_focus,
-            debater_messages=debater_turns,
+            debater_messages=undigested_turns,
             transcript=state.transcript,
+            group_digests=group_digests or None,
+            missing_roles=missing_roles or None,
         )
-        decision_result = runner.ask(
-            prompt=decision_prompt,
-            timeout_sec=config.agent_timeout_sec,
-            retry_count=config.retry_count,
+        new_turns = router.new_turns(
+            CallKind.DECISION,
+            AgentRole.MODERATOR,
+            state.transcript,
+            exclude=undigested_turns + digest_turns,
+        )
+        decision_result = router.ask(
+            CallKind.DECISION,
+            AgentRole.MODERATOR,
+            decision_prompt,
+            delta_prompt=(
+                build_moderator_decision_delta_prompt(
+                    round_index=round_index,
+                    focus=current_focus,
+                    debater_messages=undigested_turns,
+                    new_turns=new_turns,
+                    group_digests=group_digests or None,
+                    missing_roles=missing_roles or None,
+                )
+                if new_turns is not None
+                else None
+            ),
         )
         decision = parse_moderator_decision(
             response=decision_result.response,
             fallback_focus=current_focus,
         )
+        _record_call(
+            state,
+            config,
+            CallKind.DECISION,
+            AgentRole.MODERATOR,
+            round_index,
+            decision_prompt,
+            decision_result,
+        )
+        decision_record = state.calls[-1]
 
         if decision.reason == FALLBACK_DECISION_REASON:
-            retry_prompt = decision_prompt + "\n\n必ず判定ブロック4行を正確に出力してください。"
-            retry_result = runner.ask(
-                prompt=retry_prompt,
-                timeout_sec=config.agent_timeout_sec,
+            retry_prompt = f"{decision_prompt}\n\n{DECISION_RETRY_INSTRUCTION}"
+            retry_result = router.ask(
+                CallKind.DECISION,
+                AgentRole.MODERATOR,
+                retry_prompt,
                 retry_count=0,
+                delta_prompt=DECISION_RETRY_INSTRUCTION,
             )
             retry_decision = parse_moderator_decision(
                 response=retry_result.response,
                 fallback_focus=current_focus,
             )
+            _record_call(
+                state,
+                config,
+                CallKind.DECISION,
+                AgentRole.MODERATOR,
+                round_index,
+                retry_prompt,
+                retry_result,
+            )
             if retry_decision.reason != FALLBACK_DECISION_REASON:
                 decision_result = retry_result
                 decision = retry_decision
+                decision_record = state.calls[-1]
+        # フォールバックは採用した判定の記録にだけ付け、ラウンドごとに1回として数える
+        decision_record.fallback = decision.reason == FALLBACK_DECISION_REASON
 
         decision_text = (
             decision_result.response.strip()
@@ -302,7 +967,7 @@ def run_debate(
             )
         )
 
-        _append_turn(
+        decision_turn = _append_turn(
             state=state,
             role=AgentRole.MODERATOR,
             round_index=round_index,
@@ -313,8 +978,11 @@ def run_debate(
                 elapsed_ms=decision_result.elapsed_ms,
                 error=decision_result.error,
                 attempts=decision_result.attempts,
+                truncated=decision_result.truncated,
+                spill_path=decision_result.spill_path,
             ),
         )
+        router.mark_seen(CallKind.DECISION, AgentRole.MODERATOR, decision_turn)
 
         if config.show_live:
             label = "CONTINUE" if decision.continue_debate else "STOP"
@@ -323,14 +991,41 @@ def run_debate(
                 f"[round {round_index}] moderator decision: {label} ({decision.reason})",
             )
 
+        _finish_plan(round_plan, round_started)
+        if config.show_live:
+            _render_live_line(live_stream, f"[round {round_index}] {_format_plan(round_plan)}")
+
         current_focus = decision.next_focus or current_focus
         last_decision = decision
 
+    remaining_sec = (state.deadline_at - datetime.now(timezone.utc)).total_seconds()
+    wait_sec = remaining_sec - (predict_final_ms(state.calls) or 0) / 1000
+    _drain_late_phases(state, config, pending_phases, live_stream, wait_sec=max(0.0, wait_sec))
     final_prompt = build_final_summary_prompt(config.topic, state.transcript, state.stop_reason)
-    final_result = runner.ask(
-        prompt=final_prompt,
-        timeout_sec=config.agent_timeout_sec,
-        retry_count=config.retry_count,
+    final_plan = PlanRecord(PlanTarget.FINAL, state.round_index, predict_final_ms(state.calls))
+    state.plans.append(final_plan)
+    final_started = time.monotonic()
+    new_turns = router.new_turns(CallKind.FINAL, AgentRole.MODERATOR, state.transcript)
+    final_result = router.ask(
+        CallKind.FINAL,
+        AgentRole.MODERATOR,
+        final_prompt,
+        delta_prompt=(
+            build_final_summary_delta_prompt(state.stop_reason, new_turns)
+            if new_turns is not None
+            else None
+        ),
+    )
+    _finish_plan(final_plan, final_started)
+    router.close()
+    _record_call(
+        state,
+        config,
+        CallKind.FINAL,
+        AgentRole.MODERATOR,
+        state.round_index,
+        final_prompt,
+        final_result,
     )
     summary = _ensure_summary_sections(final_result.response)
     if not summary:
@@ -338,5 +1033,6 @@ def run_debate(
 
     if config.show_live:
         _render_live_line(live_stream, "[final] summary generated")
+        _render_live_line(live_stream, f"[final] {_format_plan(final_plan)}")
 
     return DebateResult(summary_markdown=summary, state=state)
@@ -3,6 +3,11 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from pathlib import Path
+
+
+MIN_DEBATER_COUNT = 2
+MAX_DEBATER_COUNT = 12
 
 
 class AgentRole(str, Enum):
@@ -10,13 +15,23 @@ class AgentRole(str, Enum):
     DEBATER_1 = "debater_1"
     DEBATER_2 = "debater_2"
     DEBATER_3 = "debater_3"
+    DEBATER_4 = "debater_4"
+    DEBATER_5 = "debater_5"
+    DEBATER_6 = "debater_6"
+    DEBATER_7 = "debater_7"
+    DEBATER_8 = "debater_8"
+    DEBATER_9 = "debater_9"
+    DEBATER_10 = "debater_10"
+    DEBATER_11 = "debater_11"
+    DEBATER_12 = "debater_12"
 
     @classmethod
     def debaters(cls, count: int) -> list["AgentRole"]:
-        if count not in (2, 3):
-            raise ValueError("debater count must be 2 or 3")
-        roles = [cls.DEBATER_1, cls.DEBATER_2, cls.DEBATER_3]
-        return roles[:count]
+        if not MIN_DEBATER_COUNT <= count <= MAX_DEBATER_COUNT:
+            raise ValueError(
+                f"debater count must be between {MIN_DEBATER_COUNT} and {MAX_DEBATER_COUNT}"
+            )
+        return [cls(f"debater_{index}") for index in range(1, count + 1)]
 
 
 class TurnStatus(str, Enum):
@@ -26,6 +41,32 @@ class TurnStatus(str, Enum):
     EMPTY = "empty"
 
 
+class CallKind(str, Enum):
+    FOCUS = "focus"
+    DEBATER = "debater"
+    DIGEST = "digest"
+    DECISION = "decision"
+    FINAL = "final"
+
+
+class StopKind(str, Enum):
+    MODERATOR = "moderator"
+    MAX_ROUNDS = "max_rounds"
+    DEADLINE = "deadline"
+    BUDGET = "budget"
+    ABORTED = "aborted"
+
+
+class FailureKind(str, Enum):
+    PERMANENT = "permanent"
+    TRANSIENT = "transient"
+
+
+class PlanTarget(str, Enum):
+    ROUND = "round"
+    FINAL = "final"
+
+
 @dataclass
 class TurnMessage:
     role: AgentRole
@@ -34,6 +75,8 @@ class TurnMessage:
     response: str
     elapsed_ms: int
     status: TurnStatus
+    truncated: bool = False
+    spill_path: Path | None = None
 
 
 @dataclass
@@ -44,6 +87,65 @@ class ModeratorDecision:
     next_focus: str
 
 
+@dataclass
+class CallRecord:
+    kind: CallKind
+    role: AgentRole
+    round_index: int
+    status: TurnStatus
+    elapsed_ms: int
+    attempts: int
+    prompt_chars: int
+    response_chars: int
+    fallback: bool = False
+    agent_cmd: str | None = None
+    prompt_bytes: int = 0
+    wall_ms: int = 0
+
+
+@dataclass
+class CancelledCall:
+    kind: CallKind
+    role: AgentRole
+    round_index: int
+    abandoned: bool = False
+
+
+@dataclass
+class PlanRecord:
+    target: PlanTarget
+    round_index: int
+    predicted_ms: int | None
+    actual_ms: int | None = None
+
+
+@dataclass
+class DebateUsage:
+    agent_calls: int = 0
+    prompt_chars: int = 0
+    response_chars: int = 0
+    cpu_seconds: float = 0.0
+    prompt_bytes: int = 0
+
+    @property
+    def total_chars(self) -> int:
+        return self.prompt_chars + self.response_chars
+
+    def record(
+        self,
+        prompt_chars: int,
+        response_chars: int,
+        attempts: int,
+        cpu_seconds: float,
+        prompt_bytes: int = 0,
+    ) -> None:
+        self.agent_calls += attempts
+        self.prompt_chars += prompt_chars * attempts
+        self.prompt_bytes += prompt_bytes
+        self.response_chars += response_chars
+        self.cpu_seconds += cpu_seconds
+
+
 @dataclass
 class DebateState:
     topic: str
@@ -52,3 +154,9 @@ class DebateState:
     started_at: datetime | None = None
     deadline_at: datetime | None = None
     stop_reason: str = ""
+    stop_kind: StopKind | None = None
+    abort_reason: str = ""
+    usage: DebateUsage = field(default_factory=DebateUsage)
+    calls: list[CallRecord] = field(default_factory=list)
+    plans: list[PlanRecord] = field(default_factory=list)
+    cancelled_calls: list[CancelledCall] = field(default_factory=list)
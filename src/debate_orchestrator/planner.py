@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from .models import CallKind, CallRecord
+
+RECENT_CALLS_PER_KIND = 5
+
+
+def _recent_elapsed(calls: Sequence[CallRecord], kinds: tuple[CallKind, ...] | None) -> list[int]:
+    observed = [
+        call.wall_ms or call.elapsed_ms
+        for call in calls
+        if call.attempts > 0 and (kinds is None or call.kind in kinds)
+    ]
+    return observed[-RECENT_CALLS_PER_KIND:]
+
+
+def estimate_call_ms(calls: Sequence[CallRecord], *kinds: CallKind) -> int | None:
+    # 種別ごとの直近の最大値を採用し、未観測なら同じ司会系の呼び出し、最後に全呼び出しで代用する
+    for candidates in (kinds, (CallKind.DECISION, CallKind.FOCUS), None):
+        observed = _recent_elapsed(calls, candidates)
+        if observed:
+            return max(observed)
+    return None
+
+
+def predict_round_ms(
+    calls: Sequence[CallRecord],
+    group_sizes: Sequence[int],
+    condensed: bool,
+) -> int | None:
+    debater_ms = estimate_call_ms(calls, CallKind.DEBATER)
+    decision_ms = estimate_call_ms(calls, CallKind.DECISION)
+    if debater_ms is None or decision_ms is None:
+        return None
+
+    digest_ms = estimate_call_ms(calls, CallKind.DIGEST, CallKind.DEBATER) if condensed else 0
+    phase_ms = max(
+        size * debater_ms + (digest_ms if condensed and size > 1 else 0) for size in group_sizes
+    )
+    return estimate_call_ms(calls, CallKind.FOCUS) + phase_ms + decision_ms
+
+
+def predict_final_ms(calls: Sequence[CallRecord]) -> int | None:
+    return estimate_call_ms(calls, CallKind.FINAL)
@@ -19,12 +19,42 @@ def _format_recent_transcript(transcript: list[TurnMessage], limit: int = 8) ->
         snippet = turn.response.replace("\n", " ").strip()
         if len(snippet) > 180:
             snippet = snippet[:180] + "..."
+        status = turn.status.value + ("(truncated)" if turn.truncated else "")
         lines.append(
-            f"- round={turn.round_index} role={turn.role.value} status={turn.status.value}: {snippet}"
+            f"- round={turn.round_index} role={turn.role.value} status={status}: {snippet}"
         )
     return "\n".join(lines)
 
 
+def _format_new_turns(turns: list[TurnMessage]) -> str:
+    if not turns:
+        return "（前回以降の新しい発言はありません）"
+    return _format_recent_transcript(turns, limit=len(turns))
+
+
+def _format_decision_answers(
+    debater_messages: list[TurnMessage],
+    group_digests: list[tuple[int, str]] | None,
+    missing_roles: list[AgentRole] | None,
+) -> tuple[str, str, str]:
+    debater_blocks = []
+    for group_index, digest in group_digests or []:
+        debater_blocks.append(f"[group_{group_index}]\n{digest}")
+    for message in debater_messages:
+        debater_blocks.append(f"[{message.role.value}]\n{message.response}")
+    debaters_text = "\n\n".join(debater_blocks)
+    answers_label = "議論者グループの要約と回答:" if group_digests else "議論者の回答:"
+
+    missing_text = ""
+    if missing_roles:
+        missing_ids = ", ".join(role.value for role in missing_roles)
+        missing_text = (
+            f"\n未回答の議論者: {missing_ids}"
+            "（回答は次ラウンドの履歴に反映されます。未回答を前提に判断してください）\n"
+        )
+    return answers_label, debaters_text, missing_text
+
+
 def build_moderator_focus_prompt(topic: str, round_index: int, transcript: list[TurnMessage]) -> str:
     history = _format_recent_transcript(transcript)
     return f"""
@@ -49,8 +79,9 @@ def build_debater_prompt(
     round_index: int,
     focus: str,
     transcript: list[TurnMessage],
+    perspective: str | None = None,
 ) -> str:
-    perspective = PERSPECTIVE_MAP.get(role, "一般観点")
+    perspective = perspective or PERSPECTIVE_MAP.get(role, "一般観点")
     history = _format_recent_transcript(transcript)
     return f"""
 あなたは討論参加者です。
@@ -73,14 +104,13 @@ def build_debater_prompt(
 """.strip()
 
 
-def build_moderator_decision_prompt(
+def build_group_digest_prompt(
     topic: str,
     round_index: int,
     focus: str,
+    group_index: int,
     debater_messages: list[TurnMessage],
-    transcript: list[TurnMessage],
 ) -> str:
-    history = _format_recent_transcript(transcript)
     debater_blocks = []
     for message in debater_messages:
         debater_blocks.append(f"[{message.role.value}]\n{message.response}")
@@ -88,14 +118,45 @@ def build_moderator_decision_prompt(
 
     return f"""
 あなたは討論の司会役です。
-議論を収束させる責任があります。感想ではなく意思決定に必要な比較を優先してください。
+議論者グループ group_{group_index} の発言を、司会判定に使えるグループ要約へ圧縮してください。
 
 テーマ: {topic}
 ラウンド番号: {round_index}
 今回の論点: {focus}
-議論者の回答:
+グループ内の回答:
 {debaters_text}
 
+出力ルール:
+1) 合意点・対立点・未検証の主張をそれぞれ1〜2行で書く
+2) 各行の先頭に発言者の役割IDを付ける
+3) 全体で10行以内にまとめる
+""".strip()
+
+
+def build_moderator_decision_prompt(
+    topic: str,
+    round_index: int,
+    focus: str,
+    debater_messages: list[TurnMessage],
+    transcript: list[TurnMessage],
+    group_digests: list[tuple[int, str]] | None = None,
+    missing_roles: list[AgentRole] | None = None,
+) -> str:
+    history = _format_recent_transcript(transcript)
+    answers_label, debaters_text, missing_text = _format_decision_answers(
+        debater_messages, group_digests, missing_roles
+    )
+
+    return f"""
+あなたは討論の司会役です。
+議論を収束させる責任があります。感想ではなく意思決定に必要な比較を優先してください。
+
+テーマ: {topic}
+ラウンド番号: {round_index}
+今回の論点: {focus}
+{answers_label}
+{debaters_text}
+{missing_text}
 直近履歴:
 {history}
 
@@ -124,3 +185,79 @@ def build_final_summary_prompt(topic: str, transcript: list[TurnMessage], stop_r
 ## 未解決論点
 ## 推奨アクション
 """.strip()
+
+
+def build_moderator_focus_delta_prompt(round_index: int, new_turns: list[TurnMessage]) -> str:
+    return f"""
+ラウンド番号: {round_index}
+前回以降の新しい発言:
+{_format_new_turns(new_turns)}
+
+今回ラウンドで最も重要な論点を1つに絞ってください。
+出力ルール:
+1) 1〜2文で論点を説明
+2) 最後に必ず次の形式を含める
+FOCUS: <今回の論点>
+""".strip()
+
+
+def build_debater_delta_prompt(round_index: int, focus: str, new_turns: list[TurnMessage]) -> str:
+    return f"""
+ラウンド番号: {round_index}
+今回の論点: {focus}
+前回以降の新しい発言:
+{_format_new_turns(new_turns)}
+
+出力形式:
+- 主張:
+- 根拠:
+- 反証可能性:
+- 追加検証案:
+
+上記4項目を必ず埋めてください。
+""".strip()
+
+
+def build_moderator_decision_delta_prompt(
+    round_index: int,
+    focus: str,
+    debater_messages: list[TurnMessage],
+    new_turns: list[TurnMessage],
+    group_digests: list[tuple[int, str]] | None = None,
+    missing_roles: list[AgentRole] | None = None,
+) -> str:
+    answers_label, debaters_text, missing_text = _format_decision_answers(
+        debater_messages, group_digests, missing_roles
+    )
+    return f"""
+ラウンド番号: {round_index}
+今回の論点: {focus}
+{answers_label}
+{debaters_text}
+{missing_text}
+前回以降のその他の発言:
+{_format_new_turns(new_turns)}
+
+最後に必ず次の判定ブロックを含めてください:
+DECISION: CONTINUE または STOP
+REASON: <判断理由>
+NEXT_FOCUS: <次ラウンドで扱う論点>
+CONFIDENCE: <0.0〜1.0>
+""".strip()
+
+
+def build_final_summary_delta_prompt(stop_reason: str, new_turns: list[TurnMessage]) -> str:
+    return f"""
+討論を終了します。これまでの討論結果を最終報告としてまとめてください。
+
+停止理由: {stop_reason}
+前回以降の新しい発言:
+{_format_new_turns(new_turns)}
+
+次の見出しをこの順で必ず出力してください:
+## 結論
+## 主な根拠
+## 反対意見・留保
+## 未解決論点
+## 推奨アクション
+""".strip()
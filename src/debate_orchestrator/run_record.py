@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+
+from .config import DebateConfig
+from .debate_loop import DebateResult
+
+RUN_RECORD_TYPE = "debate_run"
+RUN_RECORD_VERSION = 1
+
+
+def build_run_record(config: DebateConfig, result: DebateResult) -> dict[str, object]:
+    state = result.state
+    started_at = state.started_at or datetime.now(timezone.utc)
+    return {
+        "record_type": RUN_RECORD_TYPE,
+        "version": RUN_RECORD_VERSION,
+        "topic": config.topic,
+        "agent_cmd": config.agent_cmd,
+        "debater_count": config.debater_count,
+        "started_at": started_at.isoformat(),
+        "rounds": state.round_index,
+        "stop_kind": state.stop_kind.value if state.stop_kind else None,
+        "stop_reason": state.stop_reason,
+        "usage": asdict(state.usage),
+        "calls": [
+            {
+                "kind": call.kind.value,
+                "role": call.role.value,
+                "round": call.round_index,
+                "status": call.status.value,
+                "elapsed_ms": call.elapsed_ms,
+                "wall_ms": call.wall_ms,
+                "attempts": call.attempts,
+                "prompt_chars": call.prompt_chars,
+                "prompt_bytes": call.prompt_bytes,
+                "response_chars": call.response_chars,
+                "fallback": call.fallback,
+                "agent_cmd": call.agent_cmd,
+            }
+            for call in state.calls
+        ],
+        "plans": [
+            {
+                "target": plan.target.value,
+                "round": plan.round_index,
+                "predicted_ms": plan.predicted_ms,
+                "actual_ms": plan.actual_ms,
+            }
+            for plan in state.plans
+        ],
+        "cancelled_calls": [
+            {
+                "kind": call.kind.value,
+                "role": call.role.value,
+                "round": call.round_index,
+                "abandoned": call.abandoned,
+            }
+            for call in state.cancelled_calls
+        ],
+    }
+
+
+def save_run_record(path: Path, record: dict[str, object]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(record, ensure_ascii=False) + "\n", encoding="utf-8")
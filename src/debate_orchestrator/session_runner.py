@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import queue
+import shlex
+import subprocess
+import threading
+import time
+import uuid
+
+from .agent_runner import (
+    READ_CHUNK_BYTES,
+    STDERR_TAIL_BYTES,
+    AgentCallResult,
+    AttemptTotals,
+    BoundedCapture,
+    RetryingRunner,
+    TailCapture,
+    classify_failure,
+    pump_stream,
+)
+from .models import FailureKind, TurnStatus
+
+# JSON の \uXXXX エスケープで応答本文は最大6倍に膨らむ
+JSON_ESCAPE_RATIO = 6
+REPLY_ENVELOPE_BYTES = 4 * 1024
+
+
+class _SessionLost(Exception):
+    pass
+
+
+class _ReplyTooLarge(Exception):
+    pass
+
+
+def _process_cpu_seconds(pid: int) -> float | None:
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text(encoding="ascii")
+    except OSError:
+        return None
+    fields = stat.rsplit(")", 1)[1].split()
+    # utime, stime, cutime, cstime
+    ticks = sum(int(value) for value in fields[11:15])
+    return ticks / os.sysconf("SC_CLK_TCK")
+
+
+class _AgentSession:
+    def __init__(self, command: list[str], line_limit: int | None = None) -> None:
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self.lock = threading.Lock()
+        self.turns = 0
+        self.stderr = TailCapture(STDERR_TAIL_BYTES)
+        self._line_limit = line_limit
+        self._replies: queue.Queue[bytes | None] = queue.Queue()
+        self._cpu_seconds = 0.0
+        for target, args in (
+            (self._read_replies, ()),
+            (pump_stream, (self.process.stderr, self.stderr)),
+        ):
+            threading.Thread(target=target, args=args, daemon=True).start()
+
+    def _read_replies(self) -> None:
+        line = bytearray()
+        try:
+            while True:
+                chunk = self.process.stdout.read1(READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                while chunk:
+                    end = chunk.find(b"\n")
+                    piece, chunk = (chunk, b"") if end < 0 else (chunk[: end + 1], chunk[end + 1 :])
+                    line += piece
+                    if self._line_limit is not None and len(line) > self._line_limit:
+                        # 上限を超えた行は保持せず、超過を知らせて読み取りをやめる
+                        self._replies.put(None)
+                        return
+                    if end >= 0:
+                        self._replies.put(bytes(line))
+                        line.clear()
+            if line:
+                self._replies.put(bytes(line))
+        finally:
+            self._replies.put(b"")
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def cpu_delta(self) -> float:
+        current = _process_cpu_seconds(self.process.pid)
+        if current is None:
+            return 0.0
+        delta = max(0.0, current - self._cpu_seconds)
+        self._cpu_seconds = current
+        return delta
+
+    def exchange(self, payload: bytes, deadline: float) -> bytes:
+        try:
+            self.process.stdin.write(payload)
+            self.process.stdin.flush()
+        except OSError:
+            raise _SessionLost from None
+        try:
+            line = self._replies.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            raise subprocess.TimeoutExpired(self.process.args, 0) from None
+        if line is None:
+            raise _ReplyTooLarge
+        if not line:
+            raise _SessionLost
+        return line
+
+    def close(self) -> None:
+        if self.alive:
+            self.process.kill()
+        self.process.wait()
+        if self.process.stdin is not None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+
+
+class SessionAgentRunner(RetryingRunner):
+    def __init__(
+        self,
+        agent_cmd: str,
+        max_response_bytes: int | None = None,
+        spill_dir: Path | None = None,
+        circuit_breaker_threshold: int = 3,
+        backoff_base_sec: float = 0.5,
+        backoff_max_sec: float = 8.0,
+    ) -> None:
+        super().__init__(circuit_breaker_threshold, backoff_base_sec, backoff_max_sec)
+        command = shlex.split(agent_cmd)
+        if not command:
+            raise ValueError("agent_cmd が空です")
+        self._command = command
+        self._max_response_bytes = max_response_bytes
+        self._spill_dir = spill_dir
+        self._line_limit = (
+            None
+            if max_response_bytes is None
+            else max_response_bytes * JSON_ESCAPE_RATIO + REPLY_ENVELOPE_BYTES
+        )
+        self._lock = threading.Lock()
+        self._sessions: dict[str, _AgentSession] = {}
+
+    def _session(self, session_key: str) -> _AgentSession:
+        with self._lock:
+            session = self._sessions.get(session_key)
+            if session is not None and session.alive:
+                return session
+            if session is not None:
+                session.close()
+            session = _AgentSession(self._command, self._line_limit)
+            self._sessions[session_key] = session
+            return session
+
+    def _drop_session(self, session_key: str, session: _AgentSession) -> None:
+        with self._lock:
+            if self._sessions.get(session_key) is session:
+                del self._sessions[session_key]
+        session.close()
+
+    def end_session(self, session_key: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(session_key, None)
+        if session is not None:
+            session.close()
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def ask(self, prompt: str, timeout_sec: int, retry_count: int = 1) -> AgentCallResult:
+        session_key = f"oneshot-{uuid.uuid4().hex}"
+        try:
+            return self.ask_session(session_key, prompt, timeout_sec, retry_count)
+        finally:
+            self.end_session(session_key)
+
+    def ask_session(
+        self,
+        session_key: str,
+        prompt: str,
+        timeout_sec: int,
+        retry_count: int = 1,
+        delta_prompt: str | None = None,
+    ) -> AgentCallResult:
+        return self._run_with_retries(
+            retry_count,
+            lambda attempt, totals: self._attempt(
+                session_key, prompt, delta_prompt, timeout_sec, attempt, totals
+            ),
+        )
+
+    def _attempt(
+        self,
+        session_key: str,
+        prompt: str,
+        delta_prompt: str | None,
+        timeout_sec: int,
+        attempt: int,
+        totals: AttemptTotals,
+    ) -> AgentCallResult:
+        start = time.monotonic()
+        try:
+            session = self._session(session_key)
+        except OSError as error:
+            return AgentCallResult(
+                response="",
+                status=TurnStatus.ERROR,
+                elapsed_ms=int((time.monotonic() - start) * 1000),
+                error=f"起動失敗: {error}",
+                attempts=attempt,
+                cpu_ms=int(totals.cpu_seconds * 1000),
+                prompt_bytes=totals.prompt_bytes,
+                failure_kind=classify_failure(TurnStatus.ERROR, error=error),
+            )
+
+        with session.lock:
+            # セッションが失われて再起動した直後は差分ではなく完全なプロンプトを送る
+            text = delta_prompt if delta_prompt is not None and session.turns else prompt
+            payload = json.dumps({"prompt": text}, ensure_ascii=False).encode("utf-8") + b"\n"
+            totals.prompt_bytes += len(payload)
+            try:
+                line = session.exchange(payload, start + timeout_sec)
+                reply = json.loads(line)
+                if not isinstance(reply, dict):
+                    raise ValueError(reply)
+            except subprocess.TimeoutExpired:
+                reply = None
+                status, error, returncode = TurnStatus.TIMEOUT, f"タイムアウト: {timeout_sec}秒", None
+            except _ReplyTooLarge:
+                reply = None
+                status, returncode = TurnStatus.ERROR, None
+                error = f"セッション応答が上限({self._line_limit}バイト)を超えました"
+            except _SessionLost:
+                reply = None
+                try:
+                    session.process.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    pass
+                returncode = session.process.returncode
+                status, error = TurnStatus.ERROR, session.stderr.text().strip()
+                error = error or f"セッションが終了しました (終了コード: {returncode})"
+            except ValueError:
+                reply = None
+                status, error, returncode = TurnStatus.ERROR, "セッション応答がJSONではありません", None
+            totals.cpu_seconds += session.cpu_delta()
+        elapsed_ms = int((time.monotonic() - start) * 1000)
+
+        if reply is None:
+            self._drop_session(session_key, session)
+            return AgentCallResult(
+                response="",
+                status=status,
+                elapsed_ms=elapsed_ms,
+                error=error,
+                attempts=attempt,
+                cpu_ms=int(totals.cpu_seconds * 1000),
+                prompt_bytes=totals.prompt_bytes,
+                failure_kind=classify_failure(status, returncode=returncode, stderr=error),
+                sent_prompt=text,
+            )
+
+        capture = BoundedCapture(self._max_response_bytes, self._spill_dir)
+        capture.feed(str(reply.get("response") or "").encode("utf-8"))
+        capture.close()
+        response = capture.text().strip()
+        output = {
+            "cpu_ms": int(totals.cpu_seconds * 1000),
+            "prompt_bytes": totals.prompt_bytes,
+            "output_bytes": capture.total_bytes,
+            "truncated": capture.truncated,
+            "spill_path": capture.spill_path,
+            "sent_prompt": text,
+        }
+        if reply.get("error"):
+            error = str(reply["error"])
+            return AgentCallResult(
+                response=response,
+                status=TurnStatus.ERROR,
+                elapsed_ms=elapsed_ms,
+                error=error,
+                attempts=attempt,
+                failure_kind=classify_failure(TurnStatus.ERROR, stderr=error),
+                **output,
+            )
+        if not response:
+            return AgentCallResult(
+                response="",
+                status=TurnStatus.EMPTY,
+                elapsed_ms=elapsed_ms,
+                error="空の応答です",
+                attempts=attempt,
+                failure_kind=FailureKind.TRANSIENT,
+                **output,
+            )
+        session.turns += 1
+        return AgentCallResult(
+            response=response,
+            status=TurnStatus.OK,
+            elapsed_ms=elapsed_ms,
+            attempts=attempt,
+            **output,
+        )
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import tempfile
+
+from .models import CallRecord
+
+try:
+    import fcntl
+except ImportError:  # Windows ではプロセス間ロックを省略する
+    fcntl = None
+
+STATS_FORMAT_VERSION = 1
+LATENCY_BUCKETS_SEC = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+LATENCY_METRIC = "debate_agent_call_latency_seconds"
+CALLS_METRIC = "debate_agent_calls"
+
+SeriesKey = tuple[str, str, str]
+
+
+@dataclass
+class LatencyHistogram:
+    bucket_counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_SEC) + 1))
+    count: int = 0
+    sum_sec: float = 0.0
+    status_counts: dict[str, int] = field(default_factory=dict)
+
+    def observe(self, elapsed_sec: float, status: str) -> None:
+        self.bucket_counts[bisect_left(LATENCY_BUCKETS_SEC, elapsed_sec)] += 1
+        self.count += 1
+        self.sum_sec += elapsed_sec
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def quantile(self, q: float) -> float | None:
+        if not 0 <= q <= 1:
+            raise ValueError("q は0〜1を指定してください")
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                if index == len(LATENCY_BUCKETS_SEC):
+                    return LATENCY_BUCKETS_SEC[-1]
+                lower = LATENCY_BUCKETS_SEC[index - 1] if index > 0 else 0.0
+                upper = LATENCY_BUCKETS_SEC[index]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return LATENCY_BUCKETS_SEC[-1]
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "buckets": self.bucket_counts,
+            "count": self.count,
+            "sum_sec": round(self.sum_sec, 3),
+            "statuses": self.status_counts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, object]) -> "LatencyHistogram":
+        bucket_counts = [int(value) for value in data["buckets"]]
+        if len(bucket_counts) != len(LATENCY_BUCKETS_SEC) + 1:
+            raise ValueError("統計ファイルのバケット数が一致しません")
+        return cls(
+            bucket_counts=bucket_counts,
+            count=int(data["count"]),
+            sum_sec=float(data["sum_sec"]),
+            status_counts={str(key): int(value) for key, value in dict(data["statuses"]).items()},
+        )
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    return ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items())
+
+
+def _format_bound(bound: float) -> str:
+    return f"{bound:g}" if bound != int(bound) else f"{bound:.1f}"
+
+
+def render_openmetrics(series: dict[SeriesKey, LatencyHistogram]) -> str:
+    lines = [
+        f"# TYPE {LATENCY_METRIC} histogram",
+        f"# UNIT {LATENCY_METRIC} seconds",
+        f"# HELP {LATENCY_METRIC} Agent call latency by command, role and prompt kind.",
+    ]
+    for (agent_cmd, role, kind), histogram in sorted(series.items()):
+        labels = {"agent_cmd": agent_cmd, "role": role, "kind": kind}
+        cumulative = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS_SEC, histogram.bucket_counts):
+            cumulative += bucket_count
+            bucket_labels = _format_labels({**labels, "le": _format_bound(bound)})
+            lines.append(f"{LATENCY_METRIC}_bucket{{{bucket_labels}}} {cumulative}")
+        inf_labels = _format_labels({**labels, "le": "+Inf"})
+        lines.append(f"{LATENCY_METRIC}_bucket{{{inf_labels}}} {histogram.count}")
+        lines.append(f"{LATENCY_METRIC}_count{{{_format_labels(labels)}}} {histogram.count}")
+        lines.append(f"{LATENCY_METRIC}_sum{{{_format_labels(labels)}}} {histogram.sum_sec:.3f}")
+
+    lines.append(f"# TYPE {CALLS_METRIC} counter")
+    lines.append(f"# HELP {CALLS_METRIC} Agent call outcomes by command, role and prompt kind.")
+    for (agent_cmd, role, kind), histogram in sorted(series.items()):
+        for status, status_count in sorted(histogram.status_counts.items()):
+            labels = {"agent_cmd": agent_cmd, "role": role, "kind": kind, "status": status}
+            lines.append(f"{CALLS_METRIC}_total{{{_format_labels(labels)}}} {status_count}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+class LatencyStatsStore:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self.path.with_name(self.path.name + ".lock")
+        with open(lock_path, "a", encoding="utf-8") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def load(self) -> dict[SeriesKey, LatencyHistogram]:
+        if not self.path.exists():
+            return {}
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        if data.get("version") != STATS_FORMAT_VERSION:
+            raise ValueError(f"未対応の統計ファイル形式です: {data.get('version')}")
+        if tuple(data.get("buckets_sec", ())) != LATENCY_BUCKETS_SEC:
+            raise ValueError("統計ファイルのバケット境界が一致しません")
+        return {
+            (entry["agent_cmd"], entry["role"], entry["kind"]): LatencyHistogram.from_dict(entry)
+            for entry in data.get("series", [])
+        }
+
+    def _save(self, series: dict[SeriesKey, LatencyHistogram]) -> None:
+        payload = {
+            "version": STATS_FORMAT_VERSION,
+            "buckets_sec": list(LATENCY_BUCKETS_SEC),
+            "series": [
+                {"agent_cmd": agent_cmd, "role": role, "kind": kind, **histogram.to_dict()}
+                for (agent_cmd, role, kind), histogram in sorted(series.items())
+            ],
+        }
+        _write_atomic(self.path, json.dumps(payload, ensure_ascii=False, indent=2) + "\n")
+
+    def update(self, agent_cmd: str, calls: Iterable[CallRecord]) -> dict[SeriesKey, LatencyHistogram]:
+        with self._locked():
+            series = self.load()
+            for call in calls:
+                key = (call.agent_cmd or agent_cmd, call.role.value, call.kind.value)
+                series.setdefault(key, LatencyHistogram()).observe(
+                    call.elapsed_ms / 1000, call.status.value
+                )
+            self._save(series)
+            return series
+
+    def export_openmetrics(self, output_path: Path) -> None:
+        _write_atomic(output_path, render_openmetrics(self.load()))
@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+import hashlib
+import json
+import math
+import os
+from pathlib import Path
+import random
+import re
+import sys
+import threading
+import time
+
+from .agent_runner import AgentCallResult, AttemptTotals, RetryingRunner, classify_failure
+from .models import FailureKind, TurnStatus
+
+ROUND_RE = re.compile(r"ラウンド番号:\s*(\d+)")
+ROLE_RE = re.compile(r"あなたの役割ID:\s*(debater_\d+)")
+
+SYNTHETIC_FAILURE_MESSAGE = "synthetic agent failure"
+SYNTHETIC_FAILURE_EXIT_CODE = 1
+
+FILLER_SENTENCE = "補足: 前提条件と検証手順を引き続き確認する。"
+
+
+@dataclass(frozen=True)
+class Distribution:
+    kind: str = "fixed"
+    value: float = 0.0
+    median: float = 0.0
+    sigma: float = 0.0
+    samples: tuple[float, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.kind not in ("fixed", "lognormal", "trace"):
+            raise ValueError(f"未対応の分布です: {self.kind}")
+        if self.kind == "lognormal" and self.median <= 0:
+            raise ValueError("lognormal 分布の median は0より大きい値を指定してください")
+        if self.kind == "trace" and not self.samples:
+            raise ValueError("trace 分布にはサンプルが必要です")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(self.median), self.sigma)
+        if self.kind == "trace":
+            return rng.choice(self.samples)
+        return self.value
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, object]) -> "Distribution":
+        kind = str(data.get("kind", "fixed"))
+        samples: tuple[float, ...] = tuple(float(value) for value in data.get("samples", ()))
+        if kind == "trace" and "path" in data:
+            samples = load_trace(Path(str(data["path"])))
+        return cls(
+            kind=kind,
+            value=float(data.get("value", 0.0)),
+            median=float(data.get("median", 0.0)),
+            sigma=float(data.get("sigma", 0.0)),
+            samples=samples,
+        )
+
+
+def load_trace(path: Path) -> tuple[float, ...]:
+    values: list[float] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        cleaned = line.strip()
+        if cleaned and not cleaned.startswith("#"):
+            values.append(float(cleaned.split(",")[-1]))
+    return tuple(values)
+
+
+@dataclass(frozen=True)
+class SyntheticProfile:
+    latency_ms: Mapping[str, Distribution] = field(default_factory=dict)
+    timeout_rate: float = 0.0
+    error_rate: float = 0.0
+    empty_rate: float = 0.0
+    response_chars: Distribution = Distribution(kind="fixed", value=0.0)
+    stop_after_round: int = 2
+
+    def __post_init__(self) -> None:
+        rates = (self.timeout_rate, self.error_rate, self.empty_rate)
+        if any(rate < 0 for rate in rates) or sum(rates) > 1:
+            raise ValueError("失敗率は0以上かつ合計1以下を指定してください")
+        if self.stop_after_round < 1:
+            raise ValueError("stop_after_round は1以上を指定してください")
+
+    def latency_for(self, kind: str, role: str) -> Distribution:
+        for key in (role, kind, "default"):
+            if key in self.latency_ms:
+                return self.latency_ms[key]
+        return Distribution()
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, object]) -> "SyntheticProfile":
+        latency = {
+            str(key): Distribution.from_dict(value)
+            for key, value in dict(data.get("latency_ms", {})).items()
+        }
+        response_chars = data.get("response_chars")
+        return cls(
+            latency_ms=latency,
+            timeout_rate=float(data.get("timeout_rate", 0.0)),
+            error_rate=float(data.get("error_rate", 0.0)),
+            empty_rate=float(data.get("empty_rate", 0.0)),
+            response_chars=(
+                Distribution.from_dict(response_chars)
+                if isinstance(response_chars, Mapping)
+                else Distribution(kind="fixed", value=0.0)
+            ),
+            stop_after_round=int(data.get("stop_after_round", 2)),
+        )
+
+    @classmethod
+    def from_json_file(cls, path: Path) -> "SyntheticProfile":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+@dataclass(frozen=True)
+class SyntheticOutcome:
+    kind: str
+    role: str
+    status: TurnStatus
+    latency_ms: float
+    response: str
+
+
+def classify_prompt(prompt: str) -> tuple[str, str]:
+    if "最終報告" in prompt:
+        return "final", "moderator"
+    if "最後に必ず次の判定ブロックを含めてください" in prompt:
+        return "decision", "moderator"
+    if "グループ要約" in prompt:
+        return "digest", "moderator"
+    role_match = ROLE_RE.search(prompt)
+    if role_match:
+        return "debater", role_match.group(1)
+    return "focus", "moderator"
+
+
+def _extract_round(prompt: str) -> int:
+    match = ROUND_RE.search(prompt)
+    return int(match.group(1)) if match else 1
+
+
+def _pad(text: str, target_chars: int) -> str:
+    if len(text) >= target_chars:
+        return text
+    missing = target_chars - len(text)
+    repeats = missing // (len(FILLER_SENTENCE) + 1) + 1
+    filler = "\n".join([FILLER_SENTENCE] * repeats)[:missing]
+    return f"{filler}\n{text}" if filler.strip() else text
+
+
+def build_synthetic_response(kind: str, role: str, prompt: str, stop_after_round: int) -> str:
+    round_index = _extract_round(prompt)
+    if kind == "final":
+        return (
+            "## 結論\n- 段階導入が妥当。\n\n"
+            "## 主な根拠\n- 各観点で段階導入が優位。\n\n"
+            "## 反対意見・留保\n- 指標設計が不十分な可能性。\n\n"
+            "## 未解決論点\n- 閾値設定。\n\n"
+            "## 推奨アクション\n- 試行期間を設けて再評価する。"
+        )
+    if kind == "decision":
+        decision = "STOP" if round_index >= stop_after_round else "CONTINUE"
+        return (
+            f"DECISION: {decision}\n"
+            f"REASON: 合成エージェントの判定 (round={round_index})\n"
+            "NEXT_FOCUS: 運用体制とリスク許容度\n"
+            "CONFIDENCE: 0.75"
+        )
+    if kind == "digest":
+        return "- 合意点: 段階導入。\n- 対立点: 指標の閾値。\n- 未検証: 試行期間。"
+    if kind == "debater":
+        return (
+            "- 主張: 段階導入で失敗コストを下げるべき。\n"
+            f"- 根拠: {role} の観点で先行指標が有効。\n"
+            "- 反証可能性: 試行で効果がなければ見送る。\n"
+            "- 追加検証案: 2週間の試行で指標を測定する。"
+        )
+    return f"今回の論点を絞ります。\nFOCUS: 導入順序とガードレール (round={round_index})"
+
+
+class SyntheticAgent:
+    def __init__(self, profile: SyntheticProfile, seed: int = 0) -> None:
+        self._profile = profile
+        self._seed = seed
+
+    def rng_for(self, prompt: str, attempt: int) -> random.Random:
+        digest = hashlib.sha256(f"{self._seed}:{attempt}:{prompt}".encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def respond(self, prompt: str, attempt: int) -> SyntheticOutcome:
+        rng = self.rng_for(prompt, attempt)
+        kind, role = classify_prompt(prompt)
+        latency_ms = max(0.0, self._profile.latency_for(kind, role).sample(rng))
+
+        roll = rng.random()
+        profile = self._profile
+        if roll < profile.timeout_rate:
+            return SyntheticOutcome(kind, role, TurnStatus.TIMEOUT, math.inf, "")
+        roll -= profile.timeout_rate
+        if roll < profile.error_rate:
+            return SyntheticOutcome(kind, role, TurnStatus.ERROR, latency_ms, "")
+        roll -= profile.error_rate
+        if roll < profile.empty_rate:
+            return SyntheticOutcome(kind, role, TurnStatus.EMPTY, latency_ms, "")
+
+        response = build_synthetic_response(kind, role, prompt, profile.stop_after_round)
+        target_chars = int(max(0.0, profile.response_chars.sample(rng)))
+        return SyntheticOutcome(kind, role, TurnStatus.OK, latency_ms, _pad(response, target_chars))
+
+
+class SyntheticRunner(RetryingRunner):
+    def __init__(
+        self,
+        profile: SyntheticProfile,
+        seed: int = 0,
+        time_scale: float = 1.0,
+        circuit_breaker_threshold: int = 3,
+        backoff_base_sec: float = 0.5,
+        backoff_max_sec: float = 8.0,
+    ) -> None:
+        if time_scale < 0:
+            raise ValueError("time_scale は0以上を指定してください")
+        super().__init__(circuit_breaker_threshold, backoff_base_sec, backoff_max_sec)
+        self._agent = SyntheticAgent(profile, seed)
+        self._time_scale = time_scale
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._attempts_by_prompt: dict[str, int] = {}
+
+    def _next_attempt(self, prompt: str) -> int:
+        with self._lock:
+            attempt = self._attempts_by_prompt.get(prompt, 0)
+            self._attempts_by_prompt[prompt] = attempt + 1
+            return attempt
+
+    def _sleep(self, seconds: float) -> None:
+        if self._time_scale > 0 and seconds > 0:
+            time.sleep(seconds * self._time_scale)
+
+    def _wall_ms(self, started: float, totals: AttemptTotals) -> int:
+        # 実時間ではなく、模擬した応答時間と待機時間の合計を所要時間とする
+        return totals.elapsed_ms + int(totals.backoff_sec * 1000)
+
+    def ask(self, prompt: str, timeout_sec: int, retry_count: int = 1) -> AgentCallResult:
+        return self._run_with_retries(
+            retry_count,
+            lambda attempt, totals: self._attempt(prompt, timeout_sec, attempt),
+        )
+
+    def _attempt(self, prompt: str, timeout_sec: int, attempt: int) -> AgentCallResult:
+        outcome = self._agent.respond(prompt, self._next_attempt(prompt))
+        timeout_ms = timeout_sec * 1000
+
+        if outcome.latency_ms >= timeout_ms:
+            self._sleep(timeout_sec)
+            return AgentCallResult(
+                response="",
+                status=TurnStatus.TIMEOUT,
+                elapsed_ms=timeout_ms,
+                error=f"タイムアウト: {timeout_sec}秒",
+                attempts=attempt,
+                failure_kind=FailureKind.TRANSIENT,
+            )
+
+        self._sleep(outcome.latency_ms / 1000)
+        elapsed_ms = int(outcome.latency_ms)
+        if outcome.status == TurnStatus.ERROR:
+            return AgentCallResult(
+                response="",
+                status=TurnStatus.ERROR,
+                elapsed_ms=elapsed_ms,
+                error=f"終了コード: {SYNTHETIC_FAILURE_EXIT_CODE}",
+                attempts=attempt,
+                failure_kind=classify_failure(
+                    TurnStatus.ERROR,
+                    returncode=SYNTHETIC_FAILURE_EXIT_CODE,
+                    stderr=SYNTHETIC_FAILURE_MESSAGE,
+                ),
+            )
+        if outcome.status == TurnStatus.EMPTY:
+            return AgentCallResult(
+                response="",
+                status=TurnStatus.EMPTY,
+                elapsed_ms=elapsed_ms,
+                error="空の応答です",
+                attempts=attempt,
+                failure_kind=FailureKind.TRANSIENT,
+            )
+        return AgentCallResult(
+            response=outcome.response,
+            status=TurnStatus.OK,
+            elapsed_ms=elapsed_ms,
+            attempts=attempt,
+        )
+
+
+def _claim_attempt(state_dir: Path, prompt: str) -> int:
+    state_dir.mkdir(parents=True, exist_ok=True)
+    prompt_key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:32]
+    attempt = 0
+    while True:
+        marker = state_dir / f"{prompt_key}.{attempt}"
+        try:
+            os.close(os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return attempt
+        except FileExistsError:
+            attempt += 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="負荷試験用の合成エージェント")
+    parser.add_argument("--profile", type=Path, default=None, help="合成プロファイルJSON")
+    parser.add_argument("--seed", type=int, default=0, help="乱数シード")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="待ち時間の倍率")
+    parser.add_argument(
+        "--state-dir",
+        type=Path,
+        default=None,
+        help="同一プロンプトの試行回数を記録するディレクトリ (リトライ再現用)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    profile = (
+        SyntheticProfile.from_json_file(args.profile) if args.profile else SyntheticProfile()
+    )
+    prompt = sys.stdin.read()
+    attempt = _claim_attempt(args.state_dir, prompt) if args.state_dir else 0
+    outcome = SyntheticAgent(profile, args.seed).respond(prompt, attempt)
+
+    if outcome.status == TurnStatus.TIMEOUT:
+        while True:
+            time.sleep(3600)
+
+    if args.time_scale > 0:
+        time.sleep(outcome.latency_ms / 1000 * args.time_scale)
+
+    if outcome.status == TurnStatus.ERROR:
+        print(SYNTHETIC_FAILURE_MESSAGE, file=sys.stderr)
+        return SYNTHETIC_FAILURE_EXIT_CODE
+    if outcome.response:
+        print(outcome.response)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import re
 import sys
 
@@ -11,12 +12,11 @@ def _extract_round(prompt: str) -> int:
     return int(match.group(1))
 
 
-def main() -> int:
-    prompt = sys.stdin.read()
+def respond(prompt: str, session_role: str | None = None) -> str:
     round_index = _extract_round(prompt)
 
     if "最終報告" in prompt or "最終要約" in prompt:
-        print(
+        return (
             "## 結論\n"
             "- 施策は段階導入が妥当。\n\n"
             "## 主な根拠\n"
@@ -28,42 +28,64 @@ def main() -> int:
             "## 推奨アクション\n"
             "- 2週間の試行期間を設定して再評価する。"
         )
-        return 0
 
     if "最後に必ず次の判定ブロックを含めてください" in prompt:
         if round_index >= 2:
-            print(
+            return (
                 "DECISION: STOP\n"
                 "REASON: 主要論点の比較が完了したため\n"
                 "NEXT_FOCUS: 不要\n"
                 "CONFIDENCE: 0.84"
             )
-        else:
-            print(
-                "DECISION: CONTINUE\n"
-                "REASON: 追加比較が必要\n"
-                "NEXT_FOCUS: リスク許容度と運用体制の整合\n"
-                "CONFIDENCE: 0.71"
-            )
-        return 0
+        return (
+            "DECISION: CONTINUE\n"
+            "REASON: 追加比較が必要\n"
+            "NEXT_FOCUS: リスク許容度と運用体制の整合\n"
+            "CONFIDENCE: 0.71"
+        )
 
-    role_match = re.search(r"あなたの役割ID:\s*(debater_[1-3])", prompt)
-    role = role_match.group(1) if role_match else "debater_1"
+    if "グループ要約" in prompt:
+        roles = sorted(set(re.findall(r"\[(debater_\d+)\]", prompt)))
+        return (
+            f"- 合意点: {', '.join(roles)} は段階導入で一致。\n"
+            "- 対立点: 指標の閾値設定。\n"
+            "- 未検証: 試行期間の長さ。"
+        )
+
+    role_match = re.search(r"あなたの役割ID:\s*(debater_\d+)", prompt)
+    role = role_match.group(1) if role_match else session_role
 
-    if role_match:
-        print(
+    if role is not None and role.startswith("debater_"):
+        return (
             "- 主張: 段階導入で失敗コストを下げるべき。\n"
             f"- 根拠: {role} の観点から、先行指標を定義して進めると意思決定しやすい。\n"
             "- 反証可能性: 先行導入で効果が出なければ全体展開は見送る。\n"
             "- 追加検証案: 2週間の試行で指標推移を測定する。"
         )
-        return 0
 
     if "FOCUS:" in prompt:
-        print("今回の論点は導入順序とガードレール設計です。\nFOCUS: 導入順序とガードレール")
-        return 0
+        return "今回の論点は導入順序とガードレール設計です。\nFOCUS: 導入順序とガードレール"
+
+    return "FOCUS: 導入順序とガードレール"
 
-    print("FOCUS: 導入順序とガードレール")
+
+def serve_session() -> int:
+    session_role: str | None = None
+    for line in sys.stdin:
+        prompt = json.loads(line)["prompt"]
+        if session_role is None:
+            role_match = re.search(r"あなたの役割ID:\s*(debater_\d+)", prompt)
+            session_role = role_match.group(1) if role_match else "moderator"
+        response = respond(prompt, session_role)
+        sys.stdout.write(json.dumps({"response": response}, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+    return 0
+
+
+def main() -> int:
+    if "--session" in sys.argv[1:]:
+        return serve_session()
+    print(respond(sys.stdin.read()))
     return 0
 
 
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import shlex
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from debate_orchestrator.agent_runner import (
+    STDERR_TAIL_BYTES,
+    TRANSIENT_STDERR_RE,
+    AgentRunner,
+    classify_failure,
+)
+from debate_orchestrator.config import DebateConfig
+from debate_orchestrator.debate_loop import run_debate
+from debate_orchestrator.models import FailureKind, TurnStatus
+
+FLOOD_SCRIPT = (
+    "import sys; "
+    "sys.stdout.write('あ' * 200000); "
+    "sys.stderr.write('e' * 50000 + 'LAST')"
+)
+
+
+def _python_command(script: str) -> str:
+    return f"{shlex.quote(sys.executable)} -c {shlex.quote(script)}"
+
+
+class AgentRunnerOutputTests(unittest.TestCase):
+    def test_response_is_truncated_at_limit(self) -> None:
+        runner = AgentRunner(_python_command(FLOOD_SCRIPT), max_response_bytes=1000)
+
+        result = runner.ask("prompt", timeout_sec=10, retry_count=0)
+
+        self.assertEqual(result.status, TurnStatus.OK)
+        self.assertTrue(result.truncated)
+        self.assertEqual(result.output_bytes, 600000)
+        self.assertEqual(result.response, "あ" * 333)
+        self.assertIsNone(result.spill_path)
+
+    def test_overflow_is_spilled_to_file(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = AgentRunner(
+                _python_command(FLOOD_SCRIPT),
+                max_response_bytes=1000,
+                spill_dir=Path(temp_dir),
+            )
+
+            result = runner.ask("prompt", timeout_sec=10, retry_count=0)
+
+            self.assertTrue(result.truncated)
+            self.assertIsNotNone(result.spill_path)
+            self.assertEqual(result.spill_path.read_text(encoding="utf-8"), "あ" * 200000)
+
+    def test_stderr_keeps_bounded_tail(self) -> None:
+        script = "import sys; sys.stderr.write('e' * 50000 + 'LAST'); sys.exit(3)"
+        runner = AgentRunner(_python_command(script))
+
+        result = runner.ask("prompt", timeout_sec=10, retry_count=0)
+
+        self.assertEqual(result.status, TurnStatus.ERROR)
+        self.assertTrue(result.error.endswith("LAST"))
+        self.assertEqual(len(result.error), STDERR_TAIL_BYTES)
+
+    def test_output_within_limit_is_not_truncated(self) -> None:
+        runner = AgentRunner(_python_command("print('FOCUS: ok')"), max_response_bytes=1000)
+
+        result = runner.ask("prompt", timeout_sec=10, retry_count=0)
+
+        self.assertFalse(result.truncated)
+        self.assertEqual(result.response, "FOCUS: ok")
+
+    def test_timeout_is_not_held_by_background_child(self) -> None:
+        script = (
+            "import subprocess, sys, time\n"
+            "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(20)'])\n"
+            "time.sleep(30)\n"
+        )
+        runner = AgentRunner(_python_command(script))
+
+        started = time.monotonic()
+        result = runner.ask("prompt", timeout_sec=1, retry_count=0)
+
+        self.assertEqual(result.status, TurnStatus.TIMEOUT)
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_exit_is_not_held_by_background_child(self) -> None:
+        script = (
+            "import subprocess, sys\n"
+            "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(20)'])\n"
+            "print('FOCUS: ok')\n"
+        )
+        runner = AgentRunner(_python_command(script))
+
+        started = time.monotonic()
+        result = runner.ask("prompt", timeout_sec=10, retry_count=0)
+
+        self.assertEqual(result.status, TurnStatus.OK)
+        self.assertEqual(result.response, "FOCUS: ok")
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_timeout_keeps_spill_path(self) -> None:
+        script = "import sys, time; sys.stdout.write('x' * 5000); sys.stdout.flush(); time.sleep(30)"
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = AgentRunner(
+                _python_command(script),
+                max_response_bytes=1000,
+                spill_dir=Path(temp_dir),
+            )
+
+            result = runner.ask("prompt", timeout_sec=1, retry_count=0)
+
+            self.assertEqual(result.status, TurnStatus.TIMEOUT)
+            self.assertIsNotNone(result.spill_path)
+            self.assertEqual(list(Path(temp_dir).iterdir()), [result.spill_path])
+
+
+class AgentRunnerFailureTests(unittest.TestCase):
+    def test_classify_failure(self) -> None:
+        self.assertEqual(
+            classify_failure(TurnStatus.ERROR, error=FileNotFoundError("codex")),
+            FailureKind.PERMANENT,
+        )
+        self.assertEqual(classify_failure(TurnStatus.ERROR, returncode=127), FailureKind.PERMANENT)
+        self.assertEqual(
+            classify_failure(TurnStatus.ERROR, returncode=1, stderr="Error: 401 Unauthorized"),
+            FailureKind.PERMANENT,
+        )
+        self.assertEqual(
+            classify_failure(TurnStatus.ERROR, returncode=1, stderr="429 Too Many Requests"),
+            FailureKind.TRANSIENT,
+        )
+        self.assertEqual(classify_failure(TurnStatus.TIMEOUT), FailureKind.TRANSIENT)
+        self.assertIsNone(classify_failure(TurnStatus.OK))
+
+    def test_auth_failure_wins_over_retry_hint(self) -> None:
+        for stderr in (
+            "Error: not logged in. Run codex login and try again.",
+            "401 Unauthorized: invalid api key, please try again later",
+        ):
+            with self.subTest(stderr=stderr):
+                self.assertEqual(
+                    classify_failure(TurnStatus.ERROR, returncode=1, stderr=stderr),
+                    FailureKind.PERMANENT,
+                )
+
+    def test_server_error_requires_http_status(self) -> None:
+        for stderr in ("HTTP 503 Service Unavailable", "request failed: status: 502", "HTTP/1.1 500"):
+            with self.subTest(stderr=stderr):
+                self.assertEqual(
+                    classify_failure(TurnStatus.ERROR, returncode=1, stderr=stderr),
+                    FailureKind.TRANSIENT,
+                )
+        traceback = 'File "agent.py", line 512, in main\nValueError: bad prompt'
+        self.assertFalse(TRANSIENT_STDERR_RE.search(traceback))
+
+    def test_transient_errors_mentioning_usage_or_401_are_retried(self) -> None:
+        for stderr in (
+            "Rate limit reached for requests. Current usage: 100/100, try again in 20s",
+            "token usage: 1200",
+            'File "agent.py", line 401, in main\nRuntimeError: stream closed',
+        ):
+            with self.subTest(stderr=stderr):
+                self.assertEqual(
+                    classify_failure(TurnStatus.ERROR, returncode=1, stderr=stderr),
+                    FailureKind.TRANSIENT,
+                )
+        for stderr in (
+            "HTTP 403 Forbidden",
+            "request failed: status code 401",
+            "error: missing value\nusage: codex exec [OPTIONS]",
+        ):
+            with self.subTest(stderr=stderr):
+                self.assertEqual(
+                    classify_failure(TurnStatus.ERROR, returncode=2, stderr=stderr),
+                    FailureKind.PERMANENT,
+                )
+
+    def test_permanent_failure_is_not_retried(self) -> None:
+        script = "import sys; sys.stderr.write('invalid api key'); sys.exit(1)"
+        runner = AgentRunner(_python_command(script), backoff_base_sec=0)
+
+        result = runner.ask("prompt", timeout_sec=10, retry_count=3)
+
+        self.assertEqual(result.failure_kind, FailureKind.PERMANENT)
+        self.assertEqual(result.attempts, 1)
+
+    def test_transient_failure_is_retried(self) -> None:
+        script = "import sys; sys.stderr.write('server overloaded'); sys.exit(1)"
+        runner = AgentRunner(_python_command(script), backoff_base_sec=0)
+
+        result = runner.ask("prompt", timeout_sec=10, retry_count=2)
+
+        self.assertEqual(result.failure_kind, FailureKind.TRANSIENT)
+        self.assertEqual(result.attempts, 3)
+
+    def test_wall_time_covers_all_attempts(self) -> None:
+        script = "import sys, time; time.sleep(0.2); sys.stderr.write('server overloaded'); sys.exit(1)"
+        runner = AgentRunner(_python_command(script), backoff_base_sec=0)
+
+        result = runner.ask("prompt", timeout_sec=10, retry_count=2)
+
+        self.assertEqual(result.attempts, 3)
+        self.assertGreaterEqual(result.wall_ms, 600)
+        self.assertGreater(result.wall_ms, result.elapsed_ms)
+
+    def test_circuit_breaker_fails_fast_after_threshold(self) -> None:
+        runner = AgentRunner("debate-orchestrator-missing-binary", circuit_breaker_threshold=2)
+
+        first = runner.ask("prompt", timeout_sec=10, retry_count=1)
+        second = runner.ask("prompt", timeout_sec=10, retry_count=1)
+        third = runner.ask("prompt", timeout_sec=10, retry_count=1)
+
+        self.assertFalse(first.circuit_open)
+        self.assertTrue(second.circuit_open)
+        self.assertTrue(third.circuit_open)
+        self.assertEqual(third.attempts, 0)
+        self.assertIn("サーキットブレーカー作動中", third.error)
+
+    def test_run_debate_stops_early_when_circuit_opens(self) -> None:
+        command = "debate-orchestrator-missing-binary"
+        config = DebateConfig(topic="x", max_rounds=6, agent_cmd=command, show_live=False)
+
+        result = run_debate(config=config, runner=AgentRunner(command, circuit_breaker_threshold=2))
+
+        self.assertEqual(result.state.round_index, 1)
+        self.assertIn("恒久的な失敗", result.state.stop_reason)
+        self.assertIn("## 結論", result.summary_markdown)
+        self.assertTrue(all(plan.actual_ms is not None for plan in result.state.plans))
+
+
+if __name__ == "__main__":
+    unittest.main()
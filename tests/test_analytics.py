@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from debate_orchestrator.analytics import analyze, load_runs, main
+from debate_orchestrator.config import DebateConfig
+from debate_orchestrator.debate_loop import run_debate
+from debate_orchestrator.models import CallKind
+from debate_orchestrator.run_record import build_run_record, save_run_record
+from debate_orchestrator.stats import LatencyStatsStore
+from debate_orchestrator.synthetic import Distribution, SyntheticProfile, SyntheticRunner
+
+
+class MalformedFirstDecisionRunner:
+    def __init__(self) -> None:
+        self._inner = SyntheticRunner(SyntheticProfile(stop_after_round=2), seed=0, time_scale=0)
+
+    def ask(self, prompt: str, timeout_sec: int, retry_count: int = 1):
+        result = self._inner.ask(prompt, timeout_sec, retry_count)
+        if "判定ブロック" in prompt and "ラウンド番号: 1" in prompt:
+            result.response = "判定ブロックなし"
+        return result
+
+
+class AnalyticsTests(unittest.TestCase):
+    def _save_runs(self, directory: Path) -> None:
+        profile = SyntheticProfile(
+            latency_ms={
+                "default": Distribution(kind="fixed", value=1000),
+                "debater_2": Distribution(kind="fixed", value=200_000),
+            },
+            stop_after_round=2,
+        )
+        for index, topic in enumerate(["A", "A", "B"]):
+            config = DebateConfig(topic=topic, max_rounds=4, show_live=False, retry_count=0)
+            result = run_debate(config=config, runner=SyntheticRunner(profile, seed=index, time_scale=0))
+            save_run_record(directory / f"run_{index}.json", build_run_record(config, result))
+        (directory / "notes.json").write_text('{"unrelated": true}', encoding="utf-8")
+        LatencyStatsStore(directory / "stats.json").update(config.agent_cmd, result.state.calls)
+        broken = build_run_record(config, result)
+        del broken["started_at"]
+        save_run_record(directory / "broken.json", broken)
+        mistyped = build_run_record(config, result)
+        mistyped["calls"] = [{"kind": "focus", "elapsed_ms": "slow"}]
+        save_run_record(directory / "mistyped.json", mistyped)
+
+    def test_analyze_groups_saved_runs(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._save_runs(Path(temp_dir))
+
+            report = analyze(*load_runs([Path(temp_dir)]))
+
+        self.assertEqual(report["runs"], 3)
+        self.assertEqual(report["stop_kinds"], {"moderator": 3})
+        self.assertEqual(report["rounds_until_stop_by_topic"]["A"]["runs"], 2)
+        self.assertEqual(report["rounds"]["p50"], 2)
+        self.assertEqual(report["by_role"]["debater_2"]["timeout_rate"], 1.0)
+        self.assertEqual(report["by_role"]["debater_1"]["timeout_rate"], 0.0)
+        self.assertEqual(report["by_kind"]["focus"]["p50_ms"], 1000)
+        self.assertEqual(report["fallback_decision_rate"], 0.0)
+
+    def test_fallback_rate_counts_rounds_not_retry_calls(self) -> None:
+        config = DebateConfig(topic="A", max_rounds=4, show_live=False)
+        result = run_debate(config=config, runner=MalformedFirstDecisionRunner())
+
+        decision_calls = [call for call in result.state.calls if call.kind == CallKind.DECISION]
+        self.assertEqual(len(decision_calls), 3)
+        self.assertEqual([call.fallback for call in decision_calls].count(True), 1)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_run_record(Path(temp_dir) / "run.json", build_run_record(config, result))
+            report = analyze(*load_runs([Path(temp_dir)]))
+
+        self.assertEqual(report["fallback_decision_rate"], 0.5)
+
+    def test_cli_outputs_json(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._save_runs(Path(temp_dir))
+            stream = io.StringIO()
+
+            with redirect_stdout(stream):
+                exit_code = main([temp_dir, "--format", "json", "--since-days", "1"])
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(json.loads(stream.getvalue())["runs"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
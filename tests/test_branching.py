@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from dataclasses import replace
+import io
+import unittest
+
+from debate_orchestrator.branching import DebateVariant, fork_debate, snapshot_state
+from debate_orchestrator.config import DebateConfig
+from debate_orchestrator.debate_loop import run_debate
+from debate_orchestrator.models import AgentRole
+from debate_orchestrator.synthetic import SyntheticProfile, SyntheticRunner
+
+
+class BranchingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = SyntheticRunner(SyntheticProfile(stop_after_round=10), seed=5, time_scale=0)
+        self.config = DebateConfig(topic="分岐テスト", max_rounds=2, debater_count=3, show_live=False)
+        self.base = run_debate(config=self.config, runner=self.runner)
+
+    def test_snapshot_keeps_prefix_turns_shared(self) -> None:
+        snapshot = snapshot_state(self.base.state, 1)
+
+        self.assertEqual(snapshot.round_index, 1)
+        self.assertTrue(all(turn.round_index <= 1 for turn in snapshot.transcript))
+        self.assertIs(snapshot.transcript[0], self.base.state.transcript[0])
+        with self.assertRaises(ValueError):
+            snapshot_state(self.base.state, 3)
+
+    def test_fork_runs_variants_from_shared_prefix(self) -> None:
+        original_length = len(self.base.state.transcript)
+        stream = io.StringIO()
+
+        results = fork_debate(
+            config=replace(self.config, show_live=True),
+            runner=self.runner,
+            state=self.base.state,
+            at_round=2,
+            variants=[
+                DebateVariant(name="focus", focus="法務リスクの洗い出し", max_rounds=3),
+                DebateVariant(name="pair", debater_count=2, max_rounds=4),
+            ],
+            output_stream=stream,
+        )
+
+        focus_state = results["focus"].state
+        pair_state = results["pair"].state
+        self.assertEqual(focus_state.round_index, 3)
+        self.assertEqual(pair_state.round_index, 4)
+        self.assertIs(focus_state.transcript[0], pair_state.transcript[0])
+        self.assertEqual(len(self.base.state.transcript), original_length)
+
+        focus_round_three = [turn for turn in focus_state.transcript if turn.round_index == 3]
+        self.assertIn("今回の論点: 法務リスクの洗い出し", focus_round_three[0].prompt)
+
+        pair_roles = {turn.role for turn in pair_state.transcript if turn.round_index == 3}
+        self.assertNotIn(AgentRole.DEBATER_3, pair_roles)
+        self.assertIn("[branch pair]", stream.getvalue())
+
+    def test_duplicate_variant_names_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            fork_debate(
+                config=self.config,
+                runner=self.runner,
+                state=self.base.state,
+                at_round=1,
+                variants=[DebateVariant(name="a"), DebateVariant(name="a")],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,59 @@
 from __future__ import annotations
 
+from dataclasses import replace
 import io
 from pathlib import Path
 import sys
+import threading
+import time
 import unittest
 
 from debate_orchestrator.agent_runner import AgentRunner
 from debate_orchestrator.config import DebateConfig
 from debate_orchestrator.debate_loop import run_debate
+from debate_orchestrator.models import AgentRole, CallKind, CancelledCall, PlanTarget, TurnStatus
+from debate_orchestrator.synthetic import SyntheticProfile, SyntheticRunner
+
+
+class StragglerRunner:
+    def __init__(self) -> None:
+        self._inner = SyntheticRunner(SyntheticProfile(stop_after_round=2), seed=0, time_scale=0)
+        self.released = threading.Event()
+
+    def ask(self, prompt: str, timeout_sec: int, retry_count: int = 1):
+        if "あなたの役割ID: debater_3" in prompt and "ラウンド番号: 1" in prompt:
+            self.released.wait(timeout=10)
+        result = self._inner.ask(prompt, timeout_sec, retry_count)
+        if "判定ブロック" in prompt and "ラウンド番号: 1" in prompt:
+            self.released.set()
+            time.sleep(0.2)
+        return result
+
+
+class SlowDebaterRunner:
+    def __init__(self, role: AgentRole, delay_sec: float) -> None:
+        self._inner = SyntheticRunner(SyntheticProfile(stop_after_round=2), seed=0, time_scale=0)
+        self._marker = f"あなたの役割ID: {role.value}"
+        self._delay_sec = delay_sec
+
+    def ask(self, prompt: str, timeout_sec: int, retry_count: int = 1):
+        if self._marker in prompt:
+            time.sleep(self._delay_sec)
+        return self._inner.ask(prompt, timeout_sec, retry_count)
+
+
+class HangingDebaterRunner:
+    def __init__(self) -> None:
+        self._inner = SyntheticRunner(SyntheticProfile(stop_after_round=2), seed=0, time_scale=0)
+        self.released = threading.Event()
+
+    def ask(self, prompt: str, timeout_sec: int, retry_count: int = 1):
+        if "あなたの役割ID: debater_3" in prompt:
+            self.released.wait(timeout=10)
+        result = self._inner.ask(prompt, timeout_sec, retry_count)
+        if "あなたの役割ID: debater_" not in prompt:
+            result = replace(result, elapsed_ms=120_000)
+        return result
 
 
 class DebateLoopIntegrationTests(unittest.TestCase):
@@ -36,6 +82,137 @@ class DebateLoopIntegrationTests(unittest.TestCase):
         self.assertIn("## 未解決論点", result.summary_markdown)
         self.assertIn("## 推奨アクション", result.summary_markdown)
         self.assertIn("[round 1]", stream.getvalue())
+        self.assertIn("[final] planner predicted=", stream.getvalue())
+        self.assertEqual(result.state.plans[-1].target, PlanTarget.FINAL)
+        self.assertTrue(all(plan.actual_ms is not None for plan in result.state.plans))
+
+    def test_run_debate_with_grouped_debaters(self) -> None:
+        mock_agent = Path(__file__).with_name("mock_agent.py")
+        command = f"{sys.executable} {mock_agent}"
+        perspectives = ("実現性", "リスク", "コスト", "セキュリティ", "法務", "UX")
+
+        config = DebateConfig(
+            topic="社内ドキュメント運用の改善策",
+            max_rounds=1,
+            max_minutes=10,
+            debater_count=len(perspectives),
+            agent_cmd=command,
+            show_live=True,
+            agent_timeout_sec=10,
+            retry_count=0,
+            perspectives=perspectives,
+            group_size=3,
+        )
+
+        stream = io.StringIO()
+        result = run_debate(config=config, runner=AgentRunner(command), output_stream=stream)
+
+        debater_turns = [turn for turn in result.state.transcript if turn.role != AgentRole.MODERATOR]
+        self.assertEqual([turn.role for turn in debater_turns], AgentRole.debaters(6))
+        self.assertIn("あなたの観点: セキュリティ", debater_turns[3].prompt)
+        self.assertIn("group_1 digest", stream.getvalue())
+        self.assertIn("group_2 digest", stream.getvalue())
+
+        decision_prompt = result.state.transcript[-1].prompt
+        self.assertIn("[group_2]", decision_prompt)
+        self.assertNotIn("[debater_6]\n", decision_prompt)
+
+    def test_quorum_folds_straggler_into_next_round(self) -> None:
+        config = DebateConfig(
+            topic="社内ドキュメント運用の改善策",
+            max_rounds=2,
+            debater_count=3,
+            show_live=True,
+            group_size=1,
+            quorum=2,
+        )
+
+        stream = io.StringIO()
+        result = run_debate(config=config, runner=StragglerRunner(), output_stream=stream)
+
+        transcript = result.state.transcript
+        round_one_decision = next(
+            turn for turn in transcript if turn.round_index == 1 and "判定ブロック" in turn.prompt
+        )
+        self.assertIn("未回答の議論者: debater_3", round_one_decision.prompt)
+
+        late_index = next(
+            index
+            for index, turn in enumerate(transcript)
+            if turn.role == AgentRole.DEBATER_3 and turn.round_index == 1
+        )
+        self.assertGreater(late_index, transcript.index(round_one_decision))
+        self.assertEqual(transcript[late_index].status, TurnStatus.OK)
+        self.assertIn("[round 1] late debater_3", stream.getvalue())
+        round_two_prompts = [turn.prompt for turn in transcript if turn.round_index == 2]
+        self.assertTrue(any("round=1 role=debater_3" in prompt for prompt in round_two_prompts))
+
+    def test_final_summary_waits_for_straggler(self) -> None:
+        config = DebateConfig(
+            topic="社内ドキュメント運用の改善策",
+            max_rounds=1,
+            debater_count=3,
+            show_live=False,
+            group_size=1,
+            quorum=2,
+        )
+
+        result = run_debate(config=config, runner=SlowDebaterRunner(AgentRole.DEBATER_3, 0.3))
+
+        roles = [call.role for call in result.state.calls if call.kind == CallKind.DEBATER]
+        self.assertCountEqual(roles, AgentRole.debaters(3))
+        self.assertEqual(result.usage.agent_calls, len(result.state.calls))
+        self.assertEqual(result.state.calls[-1].kind, CallKind.FINAL)
+        self.assertEqual(result.state.cancelled_calls, [])
+
+    def test_unstarted_calls_are_cancelled_before_final_summary(self) -> None:
+        config = DebateConfig(
+            topic="社内ドキュメント運用の改善策",
+            max_rounds=1,
+            debater_count=3,
+            show_live=True,
+            quorum=1,
+        )
+
+        stream = io.StringIO()
+        result = run_debate(
+            config=config,
+            runner=SlowDebaterRunner(AgentRole.DEBATER_2, 0.3),
+            output_stream=stream,
+        )
+
+        roles = [call.role for call in result.state.calls if call.kind == CallKind.DEBATER]
+        self.assertEqual(roles, [AgentRole.DEBATER_1, AgentRole.DEBATER_2])
+        self.assertEqual(
+            result.state.cancelled_calls,
+            [CancelledCall(CallKind.DEBATER, AgentRole.DEBATER_3, 1)],
+        )
+        self.assertIn("[round 1] cancelled debater_3", stream.getvalue())
+
+    def test_final_wait_leaves_time_for_final_summary(self) -> None:
+        config = DebateConfig(
+            topic="社内ドキュメント運用の改善策",
+            max_rounds=1,
+            max_minutes=1,
+            debater_count=3,
+            show_live=True,
+            group_size=1,
+            quorum=2,
+        )
+        runner = HangingDebaterRunner()
+        self.addCleanup(runner.released.set)
+
+        stream = io.StringIO()
+        started = time.monotonic()
+        result = run_debate(config=config, runner=runner, output_stream=stream)
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(
+            result.state.cancelled_calls,
+            [CancelledCall(CallKind.DEBATER, AgentRole.DEBATER_3, 1, abandoned=True)],
+        )
+        self.assertIn("[round 1] abandoned debater_3", stream.getvalue())
+        self.assertEqual(result.state.calls[-1].kind, CallKind.FINAL)
 
 
 if __name__ == "__main__":
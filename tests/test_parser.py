@@ -1,8 +1,36 @@
 from __future__ import annotations
 
+from pathlib import Path
+import shlex
+import sys
+import tempfile
+import time
 import unittest
 
-from debate_orchestrator.debate_loop import FALLBACK_DECISION_REASON, parse_moderator_decision
+from debate_orchestrator.agent_runner import AgentRunner
+from debate_orchestrator.block_parser import DecisionBlock, FocusBlock, ResponseBlockParser
+from debate_orchestrator.debate_loop import (
+    FALLBACK_DECISION_REASON,
+    parse_focus,
+    parse_moderator_decision,
+)
+
+VALID_BLOCK = (
+    "議論は概ね収束。\n"
+    "DECISION: STOP\n"
+    "REASON: 主論点の比較が完了\n"
+    "NEXT_FOCUS: 不要\n"
+    "CONFIDENCE: 0.90"
+)
+
+
+def _parse_seconds(text: str) -> float:
+    start = time.perf_counter()
+    parser = ResponseBlockParser()
+    for index in range(0, len(text), 4096):
+        parser.feed(text[index : index + 4096])
+    parser.close()
+    return time.perf_counter() - start
 
 
 class ParserTests(unittest.TestCase):
@@ -41,6 +69,117 @@ class ParserTests(unittest.TestCase):
         decision = parse_moderator_decision(response, fallback_focus="次")
         self.assertEqual(decision.confidence, 1.0)
 
+    def test_parse_focus(self) -> None:
+        self.assertEqual(parse_focus("説明文\nFOCUS: 導入順序", "既定"), "導入順序")
+        self.assertEqual(parse_focus("\n  最初の行  \n次の行", "既定"), "最初の行")
+        self.assertEqual(parse_focus("", "既定"), "既定")
+        self.assertEqual(parse_focus("NEXT_FOCUS: 次論点", "既定"), "NEXT_FOCUS: 次論点")
+
+    def test_value_on_following_line(self) -> None:
+        response = "DECISION:\nCONTINUE\nREASON:\n\n  追加比較が必要\nNEXT_FOCUS: 指標\nCONFIDENCE: 0.7"
+
+        decision = parse_moderator_decision(response, fallback_focus="次")
+
+        self.assertTrue(decision.continue_debate)
+        self.assertEqual(decision.reason, "追加比較が必要")
+
+    def test_last_complete_block_wins(self) -> None:
+        response = VALID_BLOCK + "\n\nDECISION: CONTINUE\nREASON: 再検討\nNEXT_FOCUS: 費用\nCONFIDENCE: 0.4"
+
+        decision = parse_moderator_decision(response, fallback_focus="次")
+
+        self.assertTrue(decision.continue_debate)
+        self.assertEqual(decision.reason, "再検討")
+        self.assertEqual(decision.next_focus, "費用")
+
+    def test_incomplete_trailing_block_is_ignored(self) -> None:
+        response = VALID_BLOCK + "\nDECISION: CONTINUE\nREASON: 書きかけ"
+
+        decision = parse_moderator_decision(response, fallback_focus="次")
+
+        self.assertFalse(decision.continue_debate)
+        self.assertEqual(decision.reason, "主論点の比較が完了")
+
+
+class StreamingParserTests(unittest.TestCase):
+    def test_reports_blocks_as_they_complete(self) -> None:
+        parser = ResponseBlockParser()
+        events: list[tuple[int, FocusBlock | DecisionBlock]] = []
+        text = "FOCUS: 導入順序\n" + VALID_BLOCK + "\n以上"
+
+        for index, character in enumerate(text):
+            events += [(index, block) for block in parser.feed(character)]
+        events += [(len(text), block) for block in parser.close()]
+
+        self.assertEqual([block for _, block in events], [FocusBlock("導入順序"), parser.decision])
+        self.assertEqual(events[1][0], text.index("\n以上"))
+        self.assertEqual(parser.decision, DecisionBlock(False, "主論点の比較が完了", "不要", 0.9))
+
+    def test_parse_time_is_linear_on_adversarial_input(self) -> None:
+        pattern = "REASON: DECISION: STOP CONFIDENCE: 9" * 2 + "NEXT_FOCUS: " + "x" * 50 + "\n"
+        one_line = "REASON: " * 25_000
+        small = pattern * 500 + one_line
+        large = pattern * 2_000 + one_line * 4
+
+        small_seconds = min(_parse_seconds(small) for _ in range(3))
+        large_seconds = min(_parse_seconds(large) for _ in range(3))
+
+        self.assertLess(large_seconds, small_seconds * 8)
+
+    def test_agent_output_is_parsed_while_streaming(self) -> None:
+        script = (
+            "import sys, time\n"
+            "sys.stdout.write('DECISION: STOP\\nREASON: 完了\\nNEXT_FOCUS: 不要\\nCONFIDENCE: 0.8\\n')\n"
+            "sys.stdout.flush()\n"
+            "time.sleep(1)\n"
+        )
+        parser = ResponseBlockParser()
+        completed_at: list[float] = []
+
+        def on_output(attempt: int, text: str) -> None:
+            if any(isinstance(block, DecisionBlock) for block in parser.feed(text)):
+                completed_at.append(time.monotonic())
+
+        runner = AgentRunner(f"{shlex.quote(sys.executable)} -c {shlex.quote(script)}")
+        result = runner.ask("prompt", timeout_sec=10, retry_count=0, on_output=on_output)
+        returned_at = time.monotonic()
+        parser.close()
+
+        self.assertEqual(result.response.splitlines()[1], "REASON: 完了")
+        self.assertEqual(len(completed_at), 1)
+        self.assertGreater(returned_at - completed_at[0], 0.5)
+        self.assertEqual(parser.decision.reason, "完了")
+
+    def test_streamed_output_of_failed_attempt_can_be_discarded(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            marker = Path(temp_dir) / "attempted"
+            script = (
+                "import pathlib, sys\n"
+                f"marker = pathlib.Path({str(marker)!r})\n"
+                "if not marker.exists():\n"
+                "    marker.touch()\n"
+                "    print('DECISION: STOP\\nREASON: r\\nNEXT_FOCUS: n\\nCONFIDENCE: 0.9')\n"
+                "    sys.exit(1)\n"
+                "print('no block at all')\n"
+            )
+            parsers: dict[int, ResponseBlockParser] = {}
+
+            def on_output(attempt: int, text: str) -> None:
+                parsers.setdefault(attempt, ResponseBlockParser()).feed(text)
+
+            runner = AgentRunner(
+                f"{shlex.quote(sys.executable)} -c {shlex.quote(script)}",
+                backoff_base_sec=0,
+            )
+            result = runner.ask("prompt", timeout_sec=10, retry_count=1, on_output=on_output)
+
+        self.assertEqual(result.attempts, 2)
+        self.assertEqual(sorted(parsers), [1, 2])
+        self.assertIsNotNone(parsers[1].decision)
+        self.assertIsNone(parsers[result.attempts].decision)
+        fallback = parse_moderator_decision(result.response, "論点")
+        self.assertEqual(fallback.reason, FALLBACK_DECISION_REASON)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+import unittest
+
+from debate_orchestrator.config import AgentRoute, DebateConfig, parse_routes
+from debate_orchestrator.debate_loop import run_debate
+from debate_orchestrator.models import AgentRole, CallKind
+from debate_orchestrator.synthetic import SyntheticProfile, SyntheticRunner
+
+
+class RecordingRunner:
+    def __init__(self, stop_after_round: int = 1) -> None:
+        profile = SyntheticProfile(stop_after_round=stop_after_round)
+        self._inner = SyntheticRunner(profile, seed=0, time_scale=0)
+        self._lock = threading.Lock()
+        self.calls: list[tuple[int, int]] = []
+
+    def ask(self, prompt: str, timeout_sec: int, retry_count: int = 1):
+        with self._lock:
+            self.calls.append((timeout_sec, retry_count))
+        return self._inner.ask(prompt, timeout_sec, retry_count)
+
+
+class RecordingSessionRunner(RecordingRunner):
+    def __init__(self, stop_after_round: int = 1) -> None:
+        super().__init__(stop_after_round)
+        self.sessions: list[tuple[str, str | None]] = []
+
+    def ask_session(
+        self,
+        session_key: str,
+        prompt: str,
+        timeout_sec: int,
+        retry_count: int = 1,
+        delta_prompt: str | None = None,
+    ):
+        with self._lock:
+            self.sessions.append((session_key, delta_prompt))
+        return self.ask(prompt, timeout_sec, retry_count)
+
+
+class RouteConfigTests(unittest.TestCase):
+    def test_route_for_prefers_role_then_kind_then_global(self) -> None:
+        config = DebateConfig(
+            topic="x",
+            agent_cmd="strong",
+            agent_timeout_sec=120,
+            retry_count=1,
+            routes={
+                "debater": AgentRoute(agent_cmd="fast", timeout_sec=30),
+                "debater_2": AgentRoute(timeout_sec=60),
+            },
+        ).validate()
+
+        self.assertEqual(
+            config.route_for(CallKind.DEBATER, AgentRole.DEBATER_2),
+            AgentRoute(agent_cmd="fast", timeout_sec=60, retry_count=1),
+        )
+        self.assertEqual(
+            config.route_for(CallKind.DEBATER, AgentRole.DEBATER_1),
+            AgentRoute(agent_cmd="fast", timeout_sec=30, retry_count=1),
+        )
+        self.assertEqual(
+            config.route_for(CallKind.FINAL, AgentRole.MODERATOR),
+            AgentRoute(agent_cmd="strong", timeout_sec=120, retry_count=1),
+        )
+        self.assertEqual(config.agent_commands(), ["strong", "fast"])
+
+    def test_parse_routes(self) -> None:
+        routes = parse_routes(
+            ["focus=codex exec -c model_reasoning_effort=\"low\""],
+            ["focus=30", "decision=45"],
+            ["decision=0"],
+        )
+
+        self.assertEqual(routes["focus"].agent_cmd, 'codex exec -c model_reasoning_effort="low"')
+        self.assertEqual(routes["focus"].timeout_sec, 30)
+        self.assertEqual(routes["decision"], AgentRoute(timeout_sec=45, retry_count=0))
+
+    def test_invalid_routes_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            parse_routes(["focus"], [], [])
+        with self.assertRaises(ValueError):
+            parse_routes([], ["focus=soon"], [])
+        with self.assertRaises(ValueError):
+            DebateConfig(topic="x", routes={"summary": AgentRoute(agent_cmd="fast")}).validate()
+        with self.assertRaises(ValueError):
+            DebateConfig(topic="x", routes={"debater_4": AgentRoute(agent_cmd="fast")}).validate()
+        with self.assertRaises(ValueError):
+            DebateConfig(topic="x", routes={"focus": AgentRoute(timeout_sec=1)}).validate()
+
+
+class RoutedDebateTests(unittest.TestCase):
+    def test_calls_are_dispatched_to_routed_runners(self) -> None:
+        config = DebateConfig(
+            topic="x",
+            max_rounds=2,
+            agent_cmd="strong",
+            show_live=False,
+            routes={
+                "focus": AgentRoute(agent_cmd="fast", timeout_sec=30),
+                "decision": AgentRoute(agent_cmd="fast", retry_count=0),
+            },
+        )
+        strong = RecordingRunner()
+        fast = RecordingRunner()
+
+        result = run_debate(config=config, runner=strong, runners={"strong": strong, "fast": fast})
+
+        self.assertEqual(fast.calls, [(30, 1), (120, 0)])
+        self.assertEqual(len(strong.calls), 4)
+        commands = {call.kind: call.agent_cmd for call in result.state.calls}
+        self.assertEqual(commands[CallKind.FOCUS], "fast")
+        self.assertEqual(commands[CallKind.DECISION], "fast")
+        self.assertEqual(commands[CallKind.DEBATER], "strong")
+        self.assertEqual(commands[CallKind.FINAL], "strong")
+
+    def test_missing_routed_runner_is_rejected(self) -> None:
+        config = DebateConfig(
+            topic="x",
+            agent_cmd="strong",
+            show_live=False,
+            routes={"focus": AgentRoute(agent_cmd="fast")},
+        )
+        strong = RecordingRunner()
+
+        with self.assertRaises(ValueError):
+            run_debate(config=config, runner=strong, runners={"strong": strong})
+        self.assertEqual(strong.calls, [])
+
+    def test_session_deltas_follow_the_routed_command(self) -> None:
+        config = DebateConfig(
+            topic="x",
+            max_rounds=2,
+            agent_cmd="strong",
+            show_live=False,
+            session_mode=True,
+            routes={"focus": AgentRoute(agent_cmd="fast")},
+        )
+        strong = RecordingSessionRunner(stop_after_round=2)
+        fast = RecordingSessionRunner(stop_after_round=2)
+
+        result = run_debate(config=config, runner=strong, runners={"strong": strong, "fast": fast})
+
+        self.assertEqual(result.state.round_index, 2)
+        self.assertEqual(len(fast.sessions), 2)
+        self.assertIsNone(fast.sessions[0][1])
+        round_two_focus = fast.sessions[1][1]
+        self.assertIn("round=1 role=debater_1", round_two_focus)
+        self.assertIn("round=1 role=debater_2", round_two_focus)
+        self.assertIn("DECISION: CONTINUE", round_two_focus)
+        self.assertNotIn("前回以降の新しい発言はありません", round_two_focus)
+        fast_keys = {key for key, _ in fast.sessions}
+        strong_keys = {key for key, _ in strong.sessions}
+        self.assertTrue(fast_keys.isdisjoint(strong_keys))
+
+
+if __name__ == "__main__":
+    unittest.main()
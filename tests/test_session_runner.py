@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import shlex
+import sys
+import unittest
+
+from debate_orchestrator.agent_runner import AgentRunner
+from debate_orchestrator.config import DebateConfig
+from debate_orchestrator.debate_loop import run_debate
+from debate_orchestrator.models import TurnStatus
+from debate_orchestrator.session_runner import SessionAgentRunner
+
+ECHO_SCRIPT = (
+    "import json, sys\n"
+    "for line in sys.stdin:\n"
+    "    prompt = json.loads(line)['prompt']\n"
+    "    sys.stdout.write(json.dumps({'response': 'echo:' + prompt}) + '\\n')\n"
+    "    sys.stdout.flush()\n"
+    "    if '--once' in sys.argv:\n"
+    "        break\n"
+)
+
+
+def _echo_command(*args: str) -> str:
+    return " ".join(shlex.quote(part) for part in (sys.executable, "-c", ECHO_SCRIPT, *args))
+
+
+class SessionAgentRunnerTests(unittest.TestCase):
+    def test_later_turns_send_delta_prompt(self) -> None:
+        runner = SessionAgentRunner(_echo_command())
+        try:
+            first = runner.ask_session("debater_1", "full-1", timeout_sec=10, delta_prompt="delta-1")
+            second = runner.ask_session("debater_1", "full-2", timeout_sec=10, delta_prompt="delta-2")
+        finally:
+            runner.close()
+
+        self.assertEqual(first.response, "echo:full-1")
+        self.assertEqual(second.response, "echo:delta-2")
+        self.assertEqual(second.prompt_bytes, len('{"prompt": "delta-2"}\n'))
+        self.assertEqual(first.sent_prompt, "full-1")
+        self.assertEqual(second.sent_prompt, "delta-2")
+
+    def test_lost_session_falls_back_to_full_prompt(self) -> None:
+        runner = SessionAgentRunner(_echo_command("--once"), backoff_base_sec=0)
+        try:
+            runner.ask_session("moderator", "full-1", timeout_sec=10, delta_prompt="delta-1")
+            second = runner.ask_session("moderator", "full-2", timeout_sec=10, delta_prompt="delta-2")
+        finally:
+            runner.close()
+
+        self.assertEqual(second.status, TurnStatus.OK)
+        self.assertEqual(second.response, "echo:full-2")
+        self.assertEqual(second.sent_prompt, "full-2")
+
+    def test_silent_session_times_out(self) -> None:
+        script = "import sys, time\nsys.stdin.readline()\ntime.sleep(30)\n"
+        command = " ".join(shlex.quote(part) for part in (sys.executable, "-c", script))
+        runner = SessionAgentRunner(command)
+        try:
+            result = runner.ask_session("moderator", "full", timeout_sec=1, retry_count=0)
+        finally:
+            runner.close()
+
+        self.assertEqual(result.status, TurnStatus.TIMEOUT)
+
+    def test_oversized_reply_is_rejected_without_buffering(self) -> None:
+        script = (
+            "import sys\n"
+            "sys.stdin.readline()\n"
+            "sys.stdout.write('{\"response\": \"')\n"
+            "for _ in range(200):\n"
+            "    sys.stdout.write('x' * 65536)\n"
+            "    sys.stdout.flush()\n"
+            "sys.stdout.write('\"}\\n')\n"
+        )
+        command = " ".join(shlex.quote(part) for part in (sys.executable, "-c", script))
+        runner = SessionAgentRunner(command, max_response_bytes=1000)
+        try:
+            result = runner.ask_session("debater_1", "full", timeout_sec=10, retry_count=0)
+        finally:
+            runner.close()
+
+        self.assertEqual(result.status, TurnStatus.ERROR)
+        self.assertIn("上限", result.error)
+
+
+class SessionModeDebateTests(unittest.TestCase):
+    def test_session_mode_reduces_prompt_bytes(self) -> None:
+        mock_agent = Path(__file__).with_name("mock_agent.py")
+        command = f"{shlex.quote(sys.executable)} {shlex.quote(str(mock_agent))}"
+        config = DebateConfig(topic="社内ドキュメント運用の改善策", max_rounds=3, show_live=False)
+
+        stateless = run_debate(config=config, runner=AgentRunner(command))
+        session_runner = SessionAgentRunner(f"{command} --session")
+        try:
+            session = run_debate(config=replace(config, session_mode=True), runner=session_runner)
+        finally:
+            session_runner.close()
+
+        self.assertEqual(session.state.round_index, stateless.state.round_index)
+        self.assertEqual(session.state.stop_reason, stateless.state.stop_reason)
+        self.assertTrue(all(turn.status == TurnStatus.OK for turn in session.state.transcript))
+        self.assertIn("## 結論", session.summary_markdown)
+        self.assertLess(session.usage.prompt_bytes, stateless.usage.prompt_bytes)
+        self.assertLess(session.usage.prompt_chars, stateless.usage.prompt_chars)
+        later_calls = [call for call in session.state.calls if call.round_index > 1]
+        stateless_later = [call for call in stateless.state.calls if call.round_index > 1]
+        self.assertLess(
+            sum(call.prompt_chars for call in later_calls),
+            sum(call.prompt_chars for call in stateless_later),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
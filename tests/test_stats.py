@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from debate_orchestrator.models import AgentRole, CallKind, CallRecord, TurnStatus
+from debate_orchestrator.stats import LatencyHistogram, LatencyStatsStore
+
+
+def _call(kind: CallKind, role: AgentRole, elapsed_ms: int, status: TurnStatus) -> CallRecord:
+    return CallRecord(
+        kind=kind,
+        role=role,
+        round_index=1,
+        status=status,
+        elapsed_ms=elapsed_ms,
+        attempts=1,
+        prompt_chars=100,
+        response_chars=50,
+    )
+
+
+class LatencyStatsTests(unittest.TestCase):
+    def test_histogram_quantile_interpolates_within_bucket(self) -> None:
+        histogram = LatencyHistogram()
+        for _ in range(10):
+            histogram.observe(1.5, "ok")
+
+        self.assertAlmostEqual(histogram.quantile(0.5), 1.5)
+        self.assertAlmostEqual(histogram.quantile(1.0), 2.0)
+        self.assertIsNone(LatencyHistogram().quantile(0.5))
+
+    def test_update_accumulates_across_runs(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = LatencyStatsStore(Path(temp_dir) / "stats.json")
+            calls = [
+                _call(CallKind.DEBATER, AgentRole.DEBATER_1, 1200, TurnStatus.OK),
+                _call(CallKind.DEBATER, AgentRole.DEBATER_1, 130_000, TurnStatus.TIMEOUT),
+                _call(CallKind.FINAL, AgentRole.MODERATOR, 8000, TurnStatus.OK),
+            ]
+
+            store.update("codex exec", calls)
+            series = store.update("codex exec", calls[:1])
+
+            debater = series[("codex exec", "debater_1", "debater")]
+            self.assertEqual(debater.count, 3)
+            self.assertEqual(debater.status_counts, {"ok": 2, "timeout": 1})
+            self.assertEqual(store.load()[("codex exec", "moderator", "final")].count, 1)
+            self.assertEqual(list(Path(temp_dir).glob("*.tmp")), [])
+
+    def test_export_openmetrics(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = LatencyStatsStore(Path(temp_dir) / "stats.json")
+            store.update(
+                'codex exec -c model="x"',
+                [_call(CallKind.FOCUS, AgentRole.MODERATOR, 700, TurnStatus.OK)],
+            )
+            output_path = Path(temp_dir) / "metrics.txt"
+
+            store.export_openmetrics(output_path)
+
+            text = output_path.read_text(encoding="utf-8")
+            labels = 'agent_cmd="codex exec -c model=\\"x\\"",role="moderator",kind="focus"'
+            self.assertIn(f'debate_agent_call_latency_seconds_bucket{{{labels},le="0.5"}} 0', text)
+            self.assertIn(f'debate_agent_call_latency_seconds_bucket{{{labels},le="1.0"}} 1', text)
+            self.assertIn(f'debate_agent_calls_total{{{labels},status="ok"}} 1', text)
+            self.assertTrue(text.endswith("# EOF\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
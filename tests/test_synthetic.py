@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from debate_orchestrator.agent_runner import AgentRunner
+from debate_orchestrator.config import DebateConfig
+from debate_orchestrator.debate_loop import run_debate
+from debate_orchestrator.models import FailureKind, TurnStatus
+from debate_orchestrator.synthetic import (
+    Distribution,
+    SyntheticProfile,
+    SyntheticRunner,
+    classify_prompt,
+)
+
+
+class SyntheticRunnerTests(unittest.TestCase):
+    def test_same_seed_reproduces_outcomes(self) -> None:
+        profile = SyntheticProfile(
+            latency_ms={"default": Distribution(kind="lognormal", median=800, sigma=0.7)},
+            error_rate=0.3,
+            empty_rate=0.2,
+            response_chars=Distribution(kind="lognormal", median=500, sigma=1.0),
+        )
+        prompts = [f"ラウンド番号: {index}\nあなたの役割ID: debater_1" for index in range(20)]
+
+        first = SyntheticRunner(profile, seed=7, time_scale=0)
+        second = SyntheticRunner(profile, seed=7, time_scale=0)
+        first_results = [first.ask(prompt, timeout_sec=10, retry_count=1) for prompt in prompts]
+        second_results = [second.ask(prompt, timeout_sec=10, retry_count=1) for prompt in prompts]
+
+        self.assertEqual(first_results, second_results)
+        self.assertIn(TurnStatus.OK, {result.status for result in first_results})
+
+    def test_slow_latency_is_reported_as_timeout_after_retries(self) -> None:
+        profile = SyntheticProfile(latency_ms={"final": Distribution(kind="fixed", value=20_000)})
+        runner = SyntheticRunner(profile, seed=1, time_scale=0)
+
+        result = runner.ask("最終報告としてまとめてください", timeout_sec=5, retry_count=2)
+
+        self.assertEqual(result.status, TurnStatus.TIMEOUT)
+        self.assertEqual(result.attempts, 3)
+        self.assertEqual(result.elapsed_ms, 5000)
+
+    def test_failures_are_classified_and_backoff_follows_time_scale(self) -> None:
+        profile = SyntheticProfile(
+            latency_ms={"default": Distribution(kind="fixed", value=1000)},
+            error_rate=1.0,
+        )
+        runner = SyntheticRunner(profile, seed=2, time_scale=0, backoff_base_sec=30)
+
+        started = time.monotonic()
+        result = runner.ask("あなたの役割ID: debater_1", timeout_sec=10, retry_count=2)
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(result.status, TurnStatus.ERROR)
+        self.assertEqual(result.failure_kind, FailureKind.TRANSIENT)
+        self.assertEqual(result.attempts, 3)
+        self.assertGreaterEqual(result.wall_ms, 3000)
+
+        slow = SyntheticRunner(
+            SyntheticProfile(latency_ms={"final": Distribution(kind="fixed", value=20_000)}),
+            time_scale=0,
+        )
+        timeout = slow.ask("最終報告としてまとめてください", timeout_sec=5, retry_count=0)
+        self.assertEqual(timeout.failure_kind, FailureKind.TRANSIENT)
+
+    def test_trace_distribution_replays_recorded_values(self) -> None:
+        profile = SyntheticProfile(
+            latency_ms={"debater_2": Distribution(kind="trace", samples=(1200.0, 3400.0))},
+        )
+        runner = SyntheticRunner(profile, seed=3, time_scale=0)
+
+        result = runner.ask("あなたの役割ID: debater_2", timeout_sec=10, retry_count=0)
+
+        self.assertIn(result.elapsed_ms, (1200, 3400))
+        self.assertEqual(classify_prompt("あなたの役割ID: debater_2"), ("debater", "debater_2"))
+
+    def test_run_debate_with_synthetic_runner(self) -> None:
+        profile = SyntheticProfile(
+            latency_ms={"default": Distribution(kind="lognormal", median=1500, sigma=0.5)},
+            response_chars=Distribution(kind="fixed", value=2000),
+            stop_after_round=3,
+        )
+        config = DebateConfig(topic="負荷試験", max_rounds=6, debater_count=6, show_live=False)
+
+        result = run_debate(config=config, runner=SyntheticRunner(profile, seed=11, time_scale=0))
+
+        self.assertEqual(result.state.round_index, 3)
+        self.assertIn("合成エージェントの判定", result.state.stop_reason)
+        self.assertIn("## 結論", result.summary_markdown)
+
+    def test_subprocess_backend_drives_agent_runner_retries(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            command = (
+                f"{sys.executable} -m debate_orchestrator.synthetic "
+                f"--time-scale 0 --state-dir {Path(temp_dir) / 'state'}"
+            )
+            profile_path = Path(temp_dir) / "profile.json"
+            profile_path.write_text('{"error_rate": 1.0}', encoding="utf-8")
+
+            runner = AgentRunner(f"{command} --profile {profile_path}", backoff_base_sec=0)
+            result = runner.ask("FOCUS を決めてください", timeout_sec=10, retry_count=2)
+
+            self.assertEqual(result.status, TurnStatus.ERROR)
+            self.assertEqual(result.attempts, 3)
+            self.assertEqual(len(list((Path(temp_dir) / "state").iterdir())), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
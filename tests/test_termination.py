@@ -5,7 +5,44 @@ import unittest
 
 from debate_orchestrator.config import DebateConfig
 from debate_orchestrator.debate_loop import should_stop
-from debate_orchestrator.models import DebateState, ModeratorDecision
+from debate_orchestrator.models import (
+    AgentRole,
+    CallKind,
+    CallRecord,
+    DebateState,
+    DebateUsage,
+    ModeratorDecision,
+    TurnStatus,
+)
+from debate_orchestrator.planner import predict_final_ms, predict_round_ms
+
+
+def _call(
+    kind: CallKind,
+    elapsed_ms: int,
+    role: AgentRole = AgentRole.MODERATOR,
+    wall_ms: int = 0,
+) -> CallRecord:
+    return CallRecord(
+        kind=kind,
+        role=role,
+        round_index=1,
+        status=TurnStatus.OK,
+        elapsed_ms=elapsed_ms,
+        attempts=1,
+        prompt_chars=100,
+        response_chars=100,
+        wall_ms=wall_ms,
+    )
+
+
+OBSERVED_ROUND = [
+    _call(CallKind.FOCUS, 10_000),
+    _call(CallKind.DEBATER, 30_000, AgentRole.DEBATER_1),
+    _call(CallKind.DEBATER, 40_000, AgentRole.DEBATER_2),
+    _call(CallKind.DEBATER, 35_000, AgentRole.DEBATER_3),
+    _call(CallKind.DECISION, 20_000),
+]
 
 
 class TerminationTests(unittest.TestCase):
@@ -40,6 +77,102 @@ class TerminationTests(unittest.TestCase):
         self.assertTrue(stop)
         self.assertIn("最大時間", reason)
 
+    def test_stop_when_call_budget_cannot_cover_next_round(self) -> None:
+        config = DebateConfig(topic="x", debater_count=3, max_agent_calls=12)
+        now = datetime.now(timezone.utc)
+        state = DebateState(
+            topic="x",
+            round_index=1,
+            started_at=now,
+            deadline_at=now + timedelta(minutes=10),
+            usage=DebateUsage(agent_calls=7),
+        )
+
+        stop, reason = should_stop(state, config, None, now=now)
+
+        self.assertTrue(stop)
+        self.assertIn("呼び出し予算", reason)
+
+    def test_continue_when_call_budget_covers_next_round(self) -> None:
+        config = DebateConfig(topic="x", debater_count=3, max_agent_calls=12)
+        now = datetime.now(timezone.utc)
+        state = DebateState(
+            topic="x",
+            round_index=1,
+            started_at=now,
+            deadline_at=now + timedelta(minutes=10),
+            usage=DebateUsage(agent_calls=6),
+        )
+
+        stop, _ = should_stop(state, config, None, now=now)
+
+        self.assertFalse(stop)
+
+    def test_stop_when_char_budget_projection_exceeded(self) -> None:
+        config = DebateConfig(topic="x", debater_count=2, max_total_chars=8_000)
+        now = datetime.now(timezone.utc)
+        state = DebateState(
+            topic="x",
+            round_index=1,
+            started_at=now,
+            deadline_at=now + timedelta(minutes=10),
+            usage=DebateUsage(agent_calls=4, prompt_chars=3_000, response_chars=1_000),
+        )
+
+        stop, reason = should_stop(state, config, None, now=now)
+
+        self.assertTrue(stop)
+        self.assertIn("文字数予算", reason)
+
+    def test_stop_when_next_round_and_final_cannot_finish_in_time(self) -> None:
+        config = DebateConfig(topic="x", debater_count=3, max_minutes=20)
+        now = datetime.now(timezone.utc)
+        state = DebateState(
+            topic="x",
+            round_index=1,
+            started_at=now - timedelta(minutes=18),
+            deadline_at=now + timedelta(minutes=2),
+            calls=list(OBSERVED_ROUND),
+        )
+
+        stop, reason = should_stop(state, config, None, now=now)
+
+        self.assertTrue(stop)
+        self.assertIn("最終要約", reason)
+
+    def test_continue_when_next_round_and_final_fit(self) -> None:
+        config = DebateConfig(topic="x", debater_count=3, max_minutes=20)
+        now = datetime.now(timezone.utc)
+        state = DebateState(
+            topic="x",
+            round_index=1,
+            started_at=now - timedelta(minutes=10),
+            deadline_at=now + timedelta(minutes=10),
+            calls=list(OBSERVED_ROUND),
+        )
+
+        stop, _ = should_stop(state, config, None, now=now)
+
+        self.assertFalse(stop)
+
+
+class PlannerTests(unittest.TestCase):
+    def test_round_prediction_uses_sequential_group_and_recent_maximum(self) -> None:
+        self.assertEqual(predict_round_ms(OBSERVED_ROUND, [3], condensed=False), 150_000)
+        self.assertEqual(predict_round_ms(OBSERVED_ROUND, [1, 1, 1], condensed=True), 70_000)
+        self.assertIsNone(predict_round_ms([], [3], condensed=False))
+
+    def test_final_prediction_falls_back_to_moderator_calls(self) -> None:
+        self.assertEqual(predict_final_ms(OBSERVED_ROUND), 20_000)
+        self.assertEqual(
+            predict_final_ms([*OBSERVED_ROUND, _call(CallKind.FINAL, 50_000)]),
+            50_000,
+        )
+
+    def test_prediction_uses_wall_time_across_retries(self) -> None:
+        retried_final = _call(CallKind.FINAL, 20_000, wall_ms=65_000)
+        self.assertEqual(predict_final_ms([*OBSERVED_ROUND, retried_final]), 65_000)
+
 
 if __name__ == "__main__":
     unittest.main()